@@ -1,3 +1,6 @@
+from fractions import Fraction
+
+
 def add_until_end(init_value, end_value, step_value):
     current = init_value
     steps = 0
@@ -8,9 +11,86 @@ def add_until_end(init_value, end_value, step_value):
             break
     print(f"init_value: {init_value}, end_value: {end_value}, step_value: {step_value}")
     print(f"Number of steps: {steps}")
+    return steps
+
+def count_steps(init_value, end_value, step_value):
+    """Return how many steps add_until_end needs, without looping and without a step limit.
+
+    This is the smallest n >= 1 with init_value + n * step_value >= end_value.
+    Ints use ceil division. Floats, Fractions and Decimals are turned into exact
+    fractions first, so the answer is exact for the numbers given rather than
+    for a float sum that picks up rounding errors along the way.
+    """
+    if not all(isinstance(value, int) for value in (init_value, end_value, step_value)):
+        init_value, end_value, step_value = Fraction(init_value), Fraction(end_value), Fraction(step_value)
+    if step_value <= 0:
+        # The value never goes up, so only the first step can reach the end
+        if init_value + step_value >= end_value:
+            return 1
+        raise ValueError(f"adding {step_value} to {init_value} never reaches {end_value}")
+    return max(1, -((init_value - end_value) // step_value))
+
+def count_steps_batch(init_values, end_values=None, step_values=None):
+    """Return count_steps for many (init, end, step) values at once as a NumPy array.
+
+    Pass three arrays (they are broadcast together), or one array of
+    (init, end, step) rows. Integer arrays use exact ceil division. For float
+    arrays the quotient is only trusted when it is clearly away from a whole
+    number; the few that are close are worked out exactly with count_steps.
+    So are integers whose distance does not fit their dtype, and every value
+    of an object array (Fractions, Decimals, big Python ints). The result is an
+    int64 array, or an object array of Python ints when some step count is too
+    big for int64, like a tiny float step. This function needs NumPy.
+    """
+    import numpy as np  # Only the batch version needs NumPy
+
+    if end_values is None:
+        triples = np.asarray(init_values)
+        init_values, end_values, step_values = triples[:, 0], triples[:, 1], triples[:, 2]
+    init_values, end_values, step_values = np.broadcast_arrays(
+        np.asarray(init_values), np.asarray(end_values), np.asarray(step_values))
+
+    never_rising = step_values <= 0
+    if np.any(never_rising & (init_values + step_values < end_values)):
+        raise ValueError("some steps never reach their end value")
+    safe_steps = np.where(never_rising, 1, step_values)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        if any(array.dtype == object for array in (init_values, end_values, step_values)):
+            # NumPy has no exact ceil for Fractions and Decimals: count_steps works out every one
+            needs_exact = np.ones(init_values.shape, dtype=bool)
+            steps = np.ones(init_values.shape, dtype=np.int64)
+        elif all(np.issubdtype(array.dtype, np.integer) for array in (init_values, end_values, step_values)):
+            distance = end_values - init_values
+            # A distance that wrapped around has the wrong sign
+            needs_exact = (distance < 0) != (end_values < init_values)
+            quotient, remainder = np.divmod(distance, safe_steps)
+            steps = quotient + (remainder != 0)
+        else:
+            distance = end_values - init_values
+            quotient = distance / safe_steps
+            steps = np.ceil(quotient)
+            # Float rounding can only move the quotient across a whole number when it is very close to one
+            needs_exact = np.abs(quotient - np.round(quotient)) <= 1e-9 * np.maximum(1.0, np.abs(quotient))
+            # Counts from 2**63 up (or inf) do not fit int64
+            too_big = ~(steps < 2.0 ** 63)
+            needs_exact |= too_big
+            steps = np.where(too_big, 1, steps)
+    needs_exact &= ~never_rising
+    result = np.maximum(1, np.where(never_rising | needs_exact, 1, steps)).astype(np.int64)
+
+    indices = list(zip(*np.nonzero(needs_exact)))
+    if indices:
+        counts = [count_steps(init_values.item(i), end_values.item(i), step_values.item(i)) for i in indices]
+        if max(counts) > np.iinfo(np.int64).max:
+            result = result.astype(object)
+        for i, count in zip(indices, counts):
+            result[i] = count
+    return result
 
 def main():
     add_until_end(0, 10, 2)
+    print(f"Number of steps (closed form): {count_steps(0, 10, 2)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,3 +1,8 @@
+from functools import lru_cache
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
 # Basic Input and output
 def calculate(a):
     return a ** 2
@@ -10,10 +15,76 @@ def calculate(a):
 def caca(a,c,b=2):
     return a ** b + c
 
+
+# Exact integer power
+## Exponentiation by squaring: square the base for every bit of the exponent
+## and multiply it in when the bit is 1, so b needs about log2(b) multiplications
+
+def int_power(a, b):
+    """Return a ** b exactly for an int a and an int b >= 0."""
+    result = 1
+    while b:
+        if b & 1:
+            result *= a
+        a *= a
+        b >>= 1
+    return result
+
+
+# Batch versions
+## Take NumPy arrays, lists or buffers (array.array, bytes, ...) and broadcast
+## a, b and c against each other like NumPy does; they need NumPy installed
+
+def calculate_batch(a):
+    """Return the square of every value in a."""
+    return caca_batch(a, 0)
+
+def caca_batch(a, c, b=2):
+    """Return a ** b + c for every broadcast combination of a, b and c.
+
+    Integer inputs give exact integers. They stay int64 when every result
+    fits, and otherwise become Python ints (an object array) computed with
+    int_power. Anything else is computed with floats.
+    """
+    import numpy as np  # Only the batch versions need NumPy
+
+    a, b, c = np.asarray(a), np.asarray(b), np.asarray(c)
+    if not all(np.issubdtype(x.dtype, np.integer) for x in (a, b, c)) or (b.size and b.min() < 0):
+        return np.power(a, b, dtype=np.float64) + c
+    a, b, c = np.broadcast_arrays(a, b, c)
+    if not a.size:
+        return a.astype(np.int64)
+
+    # Bits of every |a ** b| and |c|, worked out with floats so nothing overflows
+    abs_a = np.abs(a.astype(np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        power_bits = np.where(abs_a <= 1, 0.0, b * np.log2(abs_a))
+    c_bits = np.log2(np.abs(c.astype(np.float64)) + 1)
+    # Below 62 bits each, a ** b + c always fits; close to the limit the float
+    # estimate is checked exactly; far above it int64 is out of the question
+    borderline = (power_bits >= 62) | (c_bits >= 62)
+    fits = not np.any(power_bits >= 64.5)
+    if fits and borderline.any():
+        fits = all(INT64_MIN <= int_power(int(a[i]), int(b[i])) + int(c[i]) <= INT64_MAX
+                   for i in zip(*np.nonzero(borderline)))
+    if fits:
+        return np.power(a.astype(np.int64), b.astype(np.int64)) + c.astype(np.int64)
+    return np.frompyfunc(int_power, 2, 1)(a.astype(object), b.astype(object)) + c.astype(object)
+
+
+# Memoized versions
+## Remember the answers of the last calls; cache_info() shows the hits and misses
+## typed=True keeps 2 and 2.0 apart, since they give different results
+
+calculate_cached = lru_cache(maxsize=4096, typed=True)(calculate)
+caca_cached = lru_cache(maxsize=4096, typed=True)(caca)
+
 def main():
     b = calculate(250)
     print(f"The square of 250 is: {b}")
     c = caca(2,20)
     print(f"3 raised to the power of 2 is: {c}")
+    print(f"Squares of 0 to 4: {calculate_batch(range(5))}")
+    print(f"2 to the power of 100 plus 1: {caca_batch(2, 1, b=100)}")
 if __name__ == "__main__":
     main()
@@ -1,13 +1,97 @@
+import threading
+from types import MappingProxyType
+
+# A safer place for settings shared between threads
+## Readers get a read-only snapshot that never changes after it is made.
+## A writer builds a new snapshot and swaps it in with one assignment, which
+## other threads see either completely or not at all, so readers need no lock.
+## Writers take a lock so two updates cannot lose each other's changes.
+
+class ConfigStore:
+    """Settings that any number of threads can read without a lock"""
+
+    def __init__(self, **values):
+        self._state = (0, MappingProxyType(dict(values)))  # (version, snapshot), swapped as one
+        self._write_lock = threading.Lock()
+        self._notify_lock = threading.Lock()  # Keeps callbacks in update order
+        self._callbacks = []
+        self.last_callback_error = None  # Last error raised by a subscribed callback
+
+    def snapshot(self):
+        """Return the current settings as a read-only mapping"""
+        return self._state[1]
+
+    @property
+    def version(self):
+        """Number of updates made so far"""
+        return self._state[0]
+
+    def get(self, key, default=None):
+        """Return one setting"""
+        return self._state[1].get(key, default)
+
+    def __getitem__(self, key):
+        return self._state[1][key]
+
+    def update(self, **changes):
+        """Change some settings and tell every callback about it
+
+        Callbacks are called as callback(old_snapshot, new_snapshot) in the
+        writer's thread, in the order the updates happened, after the store is
+        unlocked, so other writers do not wait for them. An error in one is kept
+        in last_callback_error and does not stop the others or undo the update.
+        They must not call update() themselves.
+        """
+        with self._write_lock:
+            version, old = self._state
+            new_values = dict(old)
+            new_values.update(changes)
+            new = MappingProxyType(new_values)
+            self._state = (version + 1, new)
+            callbacks = list(self._callbacks)
+            # Take the next turn to notify before letting the next writer in
+            self._notify_lock.acquire()
+        try:
+            for callback in callbacks:
+                try:
+                    callback(old, new)
+                except Exception as error:
+                    self.last_callback_error = error
+        finally:
+            self._notify_lock.release()
+        return new
+
+    def subscribe(self, callback):
+        """Call callback(old_snapshot, new_snapshot) after every update"""
+        with self._write_lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling callback"""
+        with self._write_lock:
+            self._callbacks.remove(callback)
+
+
+CONFIG = ConfigStore(device_id="0000", idone="0001")
+
 # global and local variables
-DEVICE_ID = "0000"
+## DEVICE_ID and idone are kept in CONFIG, so there is one place to change them.
+## Reading values.DEVICE_ID or values.idone from another module still works:
+## Python calls the module's __getattr__ for names it does not define.
+_CONFIG_KEYS = {"DEVICE_ID": "device_id", "idone": "idone"}
+
+def __getattr__(name):
+    if name in _CONFIG_KEYS:
+        return CONFIG[_CONFIG_KEYS[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def update_device_id(new_id):
-    global DEVICE_ID  # Declare that we are using the global variable DEVICE_ID
-    DEVICE_ID = new_id 
+    CONFIG.update(device_id=new_id)
 
-idone = "0001"
 def update_device_idone(new_id):
-    global idone  
-    idone = new_id
+    CONFIG.update(idone=new_id)
+
 
-update_device_idone("0002")
-print(idone)
\ No newline at end of file
+if __name__ == "__main__":
+    update_device_idone("0002")
+    print(CONFIG["idone"])
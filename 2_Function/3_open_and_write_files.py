@@ -1,4 +1,10 @@
+import mmap
 import os
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_right
 
 def create_txt_file(filename):
     """Create a .txt file in the current folder if it doesn't exist."""
@@ -24,8 +30,229 @@ def print_file_content(filename):
         content = f.read()
         print(content)
 
+class LogWriter:
+    """Keep a .txt file open and append lines through a buffer.
+
+    Reopening the file for every line (like write_line_to_file does) is slow
+    when many lines are written, e.g. for a transaction log. LogWriter opens
+    the file once and writes lines to the disk when one of these happens:
+      - flush_every lines have been written since the last flush
+      - flush_interval_ms milliseconds have passed since the last flush; a
+        background thread checks this, so the last lines of a log that has
+        gone quiet are written too
+      - flush() or close() is called, or the with block ends
+    With fsync=True every flush also asks the OS to put the data on the disk.
+    A lock lets the background thread and the writing thread share the file.
+    The thread only holds a weak reference, so a writer that is never closed
+    can still be garbage collected; the thread then stops.
+    """
+    def __init__(self, filename, buffer_size=64 * 1024, flush_every=None,
+                 flush_interval_ms=None, fsync=False):
+        if flush_interval_ms is not None and flush_interval_ms <= 0:
+            raise ValueError(f"flush_interval_ms must be positive, got {flush_interval_ms}")
+        if not filename.endswith('.txt'):
+            filename += '.txt'
+        self.filename = filename
+        self.flush_every = flush_every
+        self.flush_interval_ms = flush_interval_ms
+        self.fsync = fsync
+        self._file = open(filename, 'a', buffering=buffer_size)
+        self._lines_since_flush = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._flusher = None
+        if flush_interval_ms is not None:
+            self._flusher = threading.Thread(
+                target=LogWriter._flush_on_time, args=(weakref.ref(self), self._closing, flush_interval_ms / 1000),
+                name=f"flush {filename}", daemon=True)
+            self._flusher.start()
+            # Wake the thread when the writer is collected without being closed
+            weakref.finalize(self, self._closing.set)
+
+    def write_line(self, text):
+        """Write the input text into the buffer with a new line."""
+        with self._lock:
+            self._file.write(text + '\n')
+            self._lines_since_flush += 1
+            if self.flush_every is not None and self._lines_since_flush >= self.flush_every:
+                self._flush()
+            elif (self.flush_interval_ms is not None
+                  and (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms):
+                self._flush()
+
+    def flush(self):
+        """Write the buffered lines to the file."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """Flush while holding the lock."""
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._lines_since_flush = 0
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def _flush_on_time(writer_ref, closing, interval):
+        """Flush buffered lines interval seconds after the last flush, until the writer is closed or collected.
+
+        The writer is only looked up through writer_ref while it is checked, never
+        while the thread waits, so this thread does not keep it alive.
+        """
+        delay = interval
+        while not closing.wait(delay):
+            writer = writer_ref()
+            if writer is None:
+                break
+            with writer._lock:
+                if writer._file.closed:
+                    break
+                if time.monotonic() - writer._last_flush >= interval:
+                    if writer._lines_since_flush:
+                        writer._flush()
+                    else:
+                        writer._last_flush = time.monotonic()  # Nothing to write, check again later
+                delay = max(writer._last_flush + interval - time.monotonic(), 0.001)
+            del writer
+
+    def close(self):
+        """Flush the buffered lines and close the file."""
+        self._closing.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def read_lines(filename):
+    """Yield the lines of the .txt file one at a time, without the new line."""
+    if not filename.endswith('.txt'):
+        filename += '.txt'
+    with open(filename, 'r') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+def read_chunks(filename, chunk_size=64 * 1024):
+    """Yield the content of the .txt file in pieces of up to chunk_size characters."""
+    if not filename.endswith('.txt'):
+        filename += '.txt'
+    with open(filename, 'r') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+class MappedTextFile:
+    """Read lines of a large .txt file through mmap instead of f.read().
+
+    The file is mapped into memory by the OS, so only the lines you ask for are
+    turned into Python strings. When the file is opened, it is scanned once in
+    blocks of index_block bytes and the number of lines before each block is
+    saved. Jumping to line N then only searches inside one block.
+    """
+    def __init__(self, filename, index_block=64 * 1024, encoding='utf-8'):
+        if not filename.endswith('.txt'):
+            filename += '.txt'
+        self.filename = filename
+        self.encoding = encoding
+        self.index_block = index_block
+        self._file = open(filename, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._block_lines = array('q')  # Number of new lines before each block
+        self._newlines = 0
+        self._build_index()
+
+    def _build_index(self):
+        """Count the new lines before every block of the file."""
+        newlines = 0
+        for start in range(0, self.size, self.index_block):
+            self._block_lines.append(newlines)
+            newlines += self._mm[start:start + self.index_block].count(b'\n')
+        self._newlines = newlines
+
+    def count_lines(self):
+        """Return the number of lines in the file."""
+        if self.size and self._mm[self.size - 1:self.size] != b'\n':
+            return self._newlines + 1  # The last line has no new line at the end
+        return self._newlines
+
+    def _line_start(self, line_number):
+        """Return the byte offset where the line starts."""
+        if line_number == 0:
+            return 0
+        # Find the last block that starts before the line
+        block = bisect_right(self._block_lines, line_number - 1) - 1
+        position = block * self.index_block
+        remaining = line_number - self._block_lines[block]
+        while True:
+            position = self._mm.find(b'\n', position) + 1
+            remaining -= 1
+            if remaining == 0:
+                return position
+
+    def line(self, line_number):
+        """Return one line (counting from 0) without the new line."""
+        if not 0 <= line_number < self.count_lines():
+            raise IndexError(f"line {line_number} out of range")
+        start = self._line_start(line_number)
+        end = self._mm.find(b'\n', start)
+        if end == -1:
+            end = self.size
+        return self._mm[start:end].decode(self.encoding)
+
+    def lines(self, first_line=0, count=None):
+        """Yield count lines starting at first_line, without the new line."""
+        line_count = self.count_lines()
+        if count is None:
+            count = line_count - first_line
+        position = self._line_start(first_line) if first_line < line_count else self.size
+        for _ in range(min(count, line_count - first_line)):
+            end = self._mm.find(b'\n', position)
+            if end == -1:
+                end = self.size
+            yield self._mm[position:end].decode(self.encoding)
+            position = end + 1
+
+    def tail(self, count):
+        """Return the last count lines of the file, without the new line."""
+        end = self.size
+        if end and self._mm[end - 1:end] == b'\n':
+            end -= 1
+        result = []
+        while len(result) < min(count, self.count_lines()):
+            start = self._mm.rfind(b'\n', 0, end) + 1
+            result.append(self._mm[start:end].decode(self.encoding))
+            end = start - 1
+        result.reverse()
+        return result
+
+    def close(self):
+        """Unmap and close the file."""
+        if self.size:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 # Example usage:
-fname = create_txt_file('example')
-write_line_to_file(fname, 'Hello, world!')
-write_line_to_file(fname, 'Another line.')
-print_file_content(fname)
+if __name__ == "__main__":
+    fname = create_txt_file('example')
+    write_line_to_file(fname, 'Hello, world!')
+    write_line_to_file(fname, 'Another line.')
+    print_file_content(fname)
@@ -13,9 +13,85 @@ Task for students:
 
 # Import helper functions from the extension file
 from extension import calculate_tax, format_currency, apply_discount, is_meal_deal_eligible
+from extension import to_cents, calculate_tax_cents, format_currency_cents, apply_discount_cents
+from menu_search import suggest_items
+from oop_modules import import_oop_module
+from coalesced_order import CoalescedOrder
+
+# Goes up by one every time a price changes, so caches know when to rebuild
+MENU_VERSION = 0
+
+class MenuPrices(dict):
+    """
+    A dict of item prices that adds one to MENU_VERSION whenever it changes.
+    
+    Every way of changing the dict goes through here, so caches keyed on
+    MENU_VERSION also see a price written straight into MENU or MENU_CENTS.
+    If cents is given, that dict is kept holding the same prices in cents.
+    """
+    cents = None
+    
+    def __init__(self, prices=(), cents=None):
+        super().__init__(prices)
+        self.cents = cents
+        self._copy_cents()
+    
+    def _copy_cents(self):
+        """Copy every price into the cents dict."""
+        if self.cents is not None:
+            dict.clear(self.cents)
+            dict.update(self.cents, {item: to_cents(price) for item, price in self.items()})
+    
+    def _changed(self):
+        """Bump MENU_VERSION after a change to any number of prices."""
+        global MENU_VERSION  # Declare that we are using the global variable MENU_VERSION
+        MENU_VERSION += 1
+        self._copy_cents()
+    
+    def __setitem__(self, item, price):
+        global MENU_VERSION
+        super().__setitem__(item, price)
+        MENU_VERSION += 1
+        if self.cents is not None:
+            dict.__setitem__(self.cents, item, to_cents(price))
+    
+    def __delitem__(self, item):
+        super().__delitem__(item)
+        self._changed()
+    
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+    
+    def pop(self, *args):
+        price = super().pop(*args)
+        self._changed()
+        return price
+    
+    def popitem(self):
+        pair = super().popitem()
+        self._changed()
+        return pair
+    
+    def setdefault(self, item, price=None):
+        if item not in self:
+            self[item] = price
+        return self[item]
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+    
+    def clear(self):
+        super().clear()
+        self._changed()
+
+# The same menu with prices in whole cents, for exact money arithmetic; filled in from MENU
+MENU_CENTS = MenuPrices()
 
 # McDonald's menu with prices
-MENU = {
+MENU = MenuPrices({
     "Big Mac": 5.99,
     "Quarter Pounder": 6.49,
     "McChicken": 4.99,
@@ -28,7 +104,71 @@ MENU = {
     "Diet Coke": 1.79,
     "Water": 1.29,
     "Coffee": 1.99
-}
+}, cents=MENU_CENTS)
+
+def set_menu_price(item, price):
+    """
+    Add a menu item or change its price.
+    
+    Args:
+        item (str): The item name
+        price (float): The new price
+        
+    Returns:
+        None
+    """
+    MENU[item] = price  # Also updates MENU_CENTS and MENU_VERSION
+
+def save_menu_snapshot(path):
+    """
+    Save the menu to a binary snapshot file (see 3_Class_and_OOP/menu_snapshot.py).
+    
+    Args:
+        path (str): File to write
+        
+    Returns:
+        None
+    """
+    menu_snapshot = import_oop_module("menu_snapshot")
+    menu = menu_snapshot.Menu("McDonald's")
+    category = menu_snapshot.example.Category("Menu")
+    for item, price in MENU.items():
+        category.add_food(menu_snapshot.example.Food(item, price))
+    menu.add_category(category)
+    menu_snapshot.save_menu(menu, path, MENU_VERSION)
+
+def read_menu_snapshot(path):
+    """
+    Read the items and prices of a snapshot file without changing the menu.
+    
+    Args:
+        path (str): File written by save_menu_snapshot() or menu_snapshot.save_menu()
+        
+    Returns:
+        dict: Item name to price
+    """
+    menu = import_oop_module("menu_snapshot").load_menu(path)
+    prices = {}
+    for category in menu.categories.values():
+        for item, food in category.foods.items():
+            if item not in prices:  # The first category wins, like Menu.get_food()
+                prices[item] = food.base_price
+    return prices
+
+def load_menu_snapshot(path):
+    """
+    Replace the menu with the items and prices in a snapshot file, so prices
+    can change without changing this file.
+    
+    Args:
+        path (str): File written by save_menu_snapshot() or menu_snapshot.save_menu()
+        
+    Returns:
+        None
+    """
+    prices = read_menu_snapshot(path)
+    MENU.clear()
+    MENU.update(prices)
 
 def display_menu():
     """
@@ -47,27 +187,61 @@ def display_menu():
     
     print("=" * 30)
 
-def take_order():
+def is_menu_item(item):
+    """
+    Check if an item can be ordered.
+    
+    Args:
+        item (str): The item name
+        
+    Returns:
+        bool: True if the item is on the menu
+    """
+    return item in MENU
+
+def parse_quantity(text):
+    """
+    Turn the quantity a customer typed into a number.
+    
+    Args:
+        text (str): The quantity as typed
+        
+    Returns:
+        int: The quantity
+        
+    Raises:
+        ValueError: If the quantity is not a positive whole number
+    """
+    quantity = int(text)
+    if quantity <= 0:
+        raise ValueError(f"quantity must be positive, got {quantity}")
+    return quantity
+
+def take_order(coalesce=False):
     """
     Take a customer order by allowing them to select multiple items.
     
+    Args:
+        coalesce (bool): Keep one line per item, adding up the quantities of repeated entries
+    
     Returns:
         list: A list of dictionaries containing item names and quantities
     """
-    order = []
+    order = CoalescedOrder() if coalesce else []
     
     while True:
         item = input("Enter menu item (or 'done' to finish): ")
         if item.lower() == 'done':
             break
-        if item not in MENU:
+        if not is_menu_item(item):
             print("Item not on menu, please choose again.")
+            suggestions = suggest_items(item, MENU, MENU_VERSION)
+            if suggestions:
+                print(f"Did you mean: {', '.join(suggestions)}?")
             continue
         quantity = input(f"Enter quantity for {item}: ")
         try:
-            quantity = int(quantity)
-            if quantity <= 0:
-                raise ValueError
+            quantity = parse_quantity(quantity)
         except ValueError:
             print("Invalid quantity, please enter a positive number.")
             continue
@@ -75,23 +249,31 @@ def take_order():
     
     return order
 
-def calculate_total(order):
+def calculate_total(order, prices=None):
     """
     Calculate the total cost of the order including tax and applying any discounts.
     
     Args:
         order (list): List of dictionaries containing item names and quantities
+        prices (dict): Item name to price, MENU by default
         
     Returns:
         tuple: (subtotal, tax, discount, total) as floats
     """
-    subtotal = 0.0
+    subtotal_cents = 0
     
-    # Calculate the subtotal by multiplying each item's price by its quantity
-    for item in order:
-        name = item["name"]
-        quantity = item["quantity"]
-        subtotal += MENU[name] * quantity
+    # Calculate the subtotal by multiplying each item's price by its quantity.
+    # Adding floats gives a slightly different result for 3 x Big Mac than for
+    # three lines of 1 x Big Mac, or for the same lines in another order, so the
+    # subtotal is added up in whole cents: any way of entering the same items
+    # gives the same totals and receipt, coalesced or not
+    if prices is None or prices is MENU:
+        for item in order:
+            subtotal_cents += MENU_CENTS[item["name"]] * item["quantity"]
+    else:
+        for item in order:
+            subtotal_cents += to_cents(prices[item["name"]]) * item["quantity"]
+    subtotal = subtotal_cents / 100
     
     # Check if the order qualifies for a meal deal (10% discount)
     ordered_items = [item["name"] for item in order]
@@ -109,18 +291,56 @@ def calculate_total(order):
     
     return (subtotal, tax, discount, total)
 
-def generate_receipt(order, financial_details):
+def calculate_total_cents(order, prices_cents=None):
+    """
+    Calculate the total cost of the order in whole cents.
+    
+    Works like calculate_total(), but the discount and tax are rounded to
+    whole cents too, so every amount is an int number of cents.
+    
+    Args:
+        order (list): List of dictionaries containing item names and quantities
+        prices_cents (dict): Item name to price in cents, MENU_CENTS by default
+        
+    Returns:
+        tuple: (subtotal, tax, discount, total) as ints in cents
+    """
+    if prices_cents is None:
+        prices_cents = MENU_CENTS
+    subtotal = 0
+    
+    for item in order:
+        subtotal += prices_cents[item["name"]] * item["quantity"]
+    
+    ordered_items = [item["name"] for item in order]
+    discount = 0
+    
+    if is_meal_deal_eligible(ordered_items):
+        discount = apply_discount_cents(subtotal, 0.10)  # 10% discount
+    
+    tax = calculate_tax_cents(subtotal - discount)
+    
+    total = subtotal - discount + tax
+    
+    return (subtotal, tax, discount, total)
+
+def generate_receipt(order, financial_details, in_cents=False, prices=None):
     """
     Generate a formatted receipt for the customer's order.
     
     Args:
         order (list): List of dictionaries containing item names and quantities
         financial_details (tuple): (subtotal, tax, discount, total)
+        in_cents (bool): True if financial_details came from calculate_total_cents()
+        prices (dict): Item name to price (in cents if in_cents), the menu by default
         
     Returns:
         str: Formatted receipt text
     """
     subtotal, tax, discount, total = financial_details
+    if prices is None:
+        prices = MENU_CENTS if in_cents else MENU
+    format_amount = format_currency_cents if in_cents else format_currency
     receipt = []
     
     # Receipt header
@@ -132,17 +352,17 @@ def generate_receipt(order, financial_details):
     for item in order:
         name = item["name"]
         quantity = item["quantity"]
-        price = MENU[name] * quantity
-        receipt.append(f"{name.ljust(20)} {str(quantity).ljust(10)} {format_currency(price).rjust(10)}")
+        price = prices[name] * quantity
+        receipt.append(f"{name.ljust(20)} {str(quantity).ljust(10)} {format_amount(price).rjust(10)}")
     
     receipt.append("-" * 40)
     
     # Financial summary
-    receipt.append(f"{'Subtotal:':.<30} {format_currency(subtotal)}")
+    receipt.append(f"{'Subtotal:':.<30} {format_amount(subtotal)}")
     if discount > 0:
-        receipt.append(f"{'Discount:':.<30} -{format_currency(discount)}")
-    receipt.append(f"{'Tax:':.<30} {format_currency(tax)}")
-    receipt.append(f"{'Total:':.<30} {format_currency(total)}")
+        receipt.append(f"{'Discount:':.<30} -{format_amount(discount)}")
+    receipt.append(f"{'Tax:':.<30} {format_amount(tax)}")
+    receipt.append(f"{'Total:':.<30} {format_amount(total)}")
     receipt.append("=" * 40)
     receipt.append("Thank you for choosing McDonald's!")
     
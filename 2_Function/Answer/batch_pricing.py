@@ -0,0 +1,120 @@
+"""
+Batch Order Pricing
+
+Prices many orders at once with NumPy. Item names are mapped to integer IDs
+against MENU, and the orders are stored as flat arrays:
+
+    item_ids    - menu item ID of every order line
+    quantities  - quantity of every order line
+    offsets     - where each order starts in the two arrays above
+                  (order i is lines offsets[i]:offsets[i + 1])
+
+The results match calculate_total() exactly: the subtotals are added up in
+whole cents like calculate_total() does, and every later step uses the same
+floating point operations, just on whole columns at a time.
+"""
+
+import importlib
+
+import numpy as np
+
+from extension import calculate_tax, apply_discount, to_cents, MEAL_DEAL_RULES
+
+MENU = importlib.import_module("4_Hands_on_real_world_task").MENU
+
+# Group bits an order needs for the meal deal
+MEAL_DEAL_MASK = MEAL_DEAL_RULES.combo_masks["Meal Deal"]
+
+def build_item_table(menu=MENU):
+    """
+    Assign an integer ID to every menu item.
+
+    Args:
+        menu (dict): Item name to price
+
+    Returns:
+        tuple: (item_ids, prices, group_masks) where item_ids maps names to IDs,
+               prices[id] is the item price in cents and group_masks[id] holds its meal deal bits
+    """
+    item_ids = {name: i for i, name in enumerate(menu)}
+    prices = np.array([to_cents(price) for price in menu.values()], dtype=np.int64)
+    group_masks = np.array([MEAL_DEAL_RULES.item_masks.get(name, 0) for name in menu], dtype=np.int64)
+    return item_ids, prices, group_masks
+
+def encode_orders(orders, item_ids):
+    """
+    Convert orders of {"name", "quantity"} dicts into flat arrays.
+
+    Args:
+        orders (list): List of orders as returned by take_order()
+        item_ids (dict): Item name to ID, from build_item_table()
+
+    Returns:
+        tuple: (line_item_ids, quantities, offsets) as NumPy arrays
+
+    Raises:
+        KeyError: If an item is not on the menu
+    """
+    line_item_ids = []
+    quantities = []
+    offsets = [0]
+    for order in orders:
+        for item in order:
+            line_item_ids.append(item_ids[item["name"]])
+            quantities.append(item["quantity"])
+        offsets.append(len(line_item_ids))
+    return (np.array(line_item_ids, dtype=np.int64),
+            np.array(quantities, dtype=np.int64),
+            np.array(offsets, dtype=np.int64))
+
+def calculate_totals_encoded(line_item_ids, quantities, offsets, prices, group_masks):
+    """
+    Price encoded orders.
+
+    Args:
+        line_item_ids (ndarray): Menu item ID of every order line
+        quantities (ndarray): Quantity of every order line
+        offsets (ndarray): Start of each order, plus the end of the last one
+        prices (ndarray): Price in cents of each menu item ID
+        group_masks (ndarray): Meal deal group bits of each menu item ID
+
+    Returns:
+        tuple: (subtotal, tax, discount, total) as float arrays, one entry per order
+    """
+    # Add up each order's lines in whole cents: a running sum over all lines,
+    # read at the order boundaries, is exact for integers
+    line_amounts = prices[line_item_ids] * quantities
+    running = np.concatenate(([0], np.cumsum(line_amounts)))
+    subtotal = (running[offsets[1:]] - running[offsets[:-1]]) / 100
+
+    # An order has a group if any of its lines has that group's bit
+    line_masks = group_masks[line_item_ids]
+    order_masks = np.zeros(len(offsets) - 1, dtype=np.int64)
+    for bit in range(int(MEAL_DEAL_MASK).bit_length()):
+        if MEAL_DEAL_MASK >> bit & 1:
+            running = np.concatenate(([0], np.cumsum(line_masks >> bit & 1)))
+            order_masks |= (running[offsets[1:]] > running[offsets[:-1]]).astype(np.int64) << bit
+
+    # Check for meal deals and apply discount if eligible
+    eligible = (order_masks & MEAL_DEAL_MASK) == MEAL_DEAL_MASK
+    discount = np.where(eligible, apply_discount(subtotal, 0.10), 0.0)
+
+    tax = calculate_tax(subtotal - discount)
+    total = subtotal - discount + tax
+
+    return (subtotal, tax, discount, total)
+
+def calculate_totals(orders, menu=MENU):
+    """
+    Calculate the totals of many orders at once.
+
+    Args:
+        orders (list): List of orders, each a list of {"name", "quantity"} dicts
+        menu (dict): Item name to price
+
+    Returns:
+        tuple: (subtotal, tax, discount, total) as float arrays, one entry per order
+    """
+    item_ids, prices, group_masks = build_item_table(menu)
+    line_item_ids, quantities, offsets = encode_orders(orders, item_ids)
+    return calculate_totals_encoded(line_item_ids, quantities, offsets, prices, group_masks)
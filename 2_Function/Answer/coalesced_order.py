@@ -0,0 +1,180 @@
+"""
+Coalesced Orders
+
+take_order() adds a new {"name", "quantity"} line every time an item is entered,
+so a catering order of 200 Big Macs typed one at a time has 200 lines, and
+calculate_total() and generate_receipt() go through all of them.
+CoalescedOrder keeps one line per distinct item and modification set instead
+and adds to its quantity:
+
+    order = CoalescedOrder()
+    order.add("Big Mac")
+    order.add("Big Mac", 2)
+    order.add("Coke")
+    # [{"name": "Big Mac", "quantity": 3}, {"name": "Coke", "quantity": 1}]
+    order.remove_units("Big Mac")   # one Big Mac less
+
+It is a list of the same dicts, in the order each item was first added, so it
+can be passed to calculate_total(), calculate_total_cents() and
+generate_receipt() unchanged; they price it the same way as any other list.
+Coalescing only changes how the lines are stored: the totals are the same as
+for the uncoalesced order, and the receipt lists each item once with its full
+quantity, as if the customer had entered it that way.
+
+Every list method keeps the lines coalesced: insert(), += and slice
+assignment merge repeated items into their first line, and pop(), del,
+remove() and clear() forget the lines they take out.
+"""
+
+class CoalescedOrder(list):
+    """List of order lines with one line per (item, modifications), kept coalesced by every list method"""
+
+    def __init__(self, items=()):
+        """
+        Create an order, coalescing any given lines.
+
+        Args:
+            items: Item dicts with "name", "quantity" and optional "modifications"
+        """
+        super().__init__()
+        self._lines = {}  # (name, sorted modifications): line dict in this list
+        self.extend(items)
+
+    @staticmethod
+    def _key(name, modifications):
+        """Return the key of a line: its name and its modifications in a fixed order."""
+        return (name, tuple(sorted(modifications)) if modifications else ())
+
+    @classmethod
+    def _line_key(cls, line):
+        """Return the key of an item dict"""
+        return cls._key(line["name"], line.get("modifications"))
+
+    def add(self, name, quantity=1, modifications=(), index=None):
+        """
+        Add units of an item, to its existing line if there is one.
+
+        Args:
+            name (str): The item name
+            quantity (int): Units to add
+            modifications: Modification names of these units
+            index (int): Where a new line goes, the end by default
+
+        Returns:
+            dict: The line the units were added to
+        """
+        key = self._key(name, modifications)
+        line = self._lines.get(key)
+        if line is None:
+            line = {"name": name, "quantity": 0}
+            if key[1]:
+                line["modifications"] = list(key[1])
+            self._lines[key] = line
+            if index is None:
+                super().append(line)
+            else:
+                super().insert(index, line)
+        line["quantity"] += quantity
+        return line
+
+    def append(self, item):
+        """Add an item dict like a list would, merging it into its existing line"""
+        modifications = item.get("modifications")
+        if modifications:
+            self.add(item["name"], item["quantity"], modifications)
+            return
+        # Most lines have no modifications: skip the sort and the extra call
+        line = self._lines.get((item["name"], ()))
+        if line is None:
+            self.add(item["name"], item["quantity"])
+        else:
+            line["quantity"] += item["quantity"]
+
+    def extend(self, items):
+        """Add every item dict, merging each into its existing line"""
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):
+        # Repeating the order is the same items count times over
+        if count <= 0:
+            self.clear()
+        for line in self:
+            line["quantity"] *= count
+        return self
+
+    def insert(self, index, item):
+        """Insert an item dict, or add it to its existing line wherever that is"""
+        self.add(item["name"], item["quantity"], item.get("modifications", ()), index)
+
+    def pop(self, index=-1):
+        """Remove and return a whole line"""
+        line = super().pop(index)
+        del self._lines[self._line_key(line)]
+        return line
+
+    def remove(self, item):
+        """Remove the whole line equal to an item dict"""
+        super().remove(item)
+        del self._lines[self._line_key(item)]
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for line in removed:
+            del self._lines[self._line_key(line)]
+
+    def __setitem__(self, index, value):
+        # Work out the new lines like a list would, then coalesce them again
+        items = list(self)
+        items[index] = value
+        self.clear()
+        self.extend(items)
+
+    def clear(self):
+        """Remove every line"""
+        super().clear()
+        self._lines.clear()
+
+    def copy(self):
+        """Return a new CoalescedOrder with copies of the lines"""
+        return type(self)(self)
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        # Rebuild from the lines, so the copy or unpickled order has its own index
+        return (type(self), (list(self),))
+
+    def remove_units(self, name, quantity=1, modifications=()):
+        """
+        Remove units of an item, and its line once none are left.
+
+        Args:
+            name (str): The item name
+            quantity (int): Units to remove
+            modifications: Modification names of these units
+
+        Raises:
+            ValueError: If the order has fewer units of the item
+        """
+        key = self._key(name, modifications)
+        line = self._lines.get(key)
+        if line is None or line["quantity"] < quantity:
+            raise ValueError(f"Order has fewer than {quantity} of {name!r}")
+        line["quantity"] -= quantity
+        if line["quantity"] == 0:
+            del self._lines[key]
+            for i, other in enumerate(self):
+                if other is line:
+                    super().__delitem__(i)
+                    break
+
+    def quantity_of(self, name, modifications=()):
+        """Return how many units of an item are in the order"""
+        line = self._lines.get(self._key(name, modifications))
+        return line["quantity"] if line is not None else 0
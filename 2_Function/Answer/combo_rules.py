@@ -0,0 +1,95 @@
+"""
+Combo Rules
+
+A combo is a set of menu groups that must all appear in an order, for example
+a meal deal needs a main, a side and a drink. ComboRules compiles the groups
+once: each group gets one bit, and each item gets the bits of every group it
+belongs to. Checking an order is then a single pass that ORs the item bits
+together, and a combo matches when all of its bits are set.
+
+Example:
+    rules = ComboRules(
+        groups={
+            "main": ["Big Mac", "McChicken"],
+            "side": ["French Fries"],
+            "drink": ["Coke", "Coffee"],
+            "breakfast": ["Egg McMuffin"],
+        },
+        combos={
+            "Meal Deal": ["main", "side", "drink"],
+            "Breakfast Combo": ["breakfast", "drink"],
+        },
+    )
+    rules.matching_combos(["Egg McMuffin", "Coffee"])  # ["Breakfast Combo"]
+"""
+
+class ComboRules:
+    """Compiled combo definitions that check orders with bitmasks"""
+
+    def __init__(self, groups, combos):
+        """
+        Compile the groups and combos.
+
+        Args:
+            groups (dict): Group name to a list of item names
+            combos (dict): Combo name to a list of group names it needs
+
+        Raises:
+            KeyError: If a combo uses a group that is not defined
+        """
+        self.group_bits = {group: 1 << i for i, group in enumerate(groups)}
+
+        self.item_masks = {}  # item name: bits of every group the item is in
+        for group, items in groups.items():
+            for item in items:
+                self.item_masks[item] = self.item_masks.get(item, 0) | self.group_bits[group]
+
+        self.combo_masks = {}  # combo name: bits the order must contain
+        for combo, needed_groups in combos.items():
+            mask = 0
+            for group in needed_groups:
+                mask |= self.group_bits[group]
+            self.combo_masks[combo] = mask
+
+    def order_mask(self, items):
+        """
+        Combine the group bits of every item in an order.
+
+        Args:
+            items (list): List of item names
+
+        Returns:
+            int: Bits of every group present in the order
+        """
+        item_masks = self.item_masks
+        mask = 0
+        for item in items:
+            mask |= item_masks.get(item, 0)
+        return mask
+
+    def matches(self, items, combo):
+        """
+        Check if the items qualify for one combo.
+
+        Args:
+            items (list): List of item names
+            combo (str): Name of the combo
+
+        Returns:
+            bool: True if the order contains every group of the combo
+        """
+        needed = self.combo_masks[combo]
+        return self.order_mask(items) & needed == needed
+
+    def matching_combos(self, items):
+        """
+        Find every combo the items qualify for.
+
+        Args:
+            items (list): List of item names
+
+        Returns:
+            list: Names of the matching combos, in the order they were defined
+        """
+        mask = self.order_mask(items)
+        return [combo for combo, needed in self.combo_masks.items() if mask & needed == needed]
@@ -1,3 +1,18 @@
+from fractions import Fraction
+from functools import lru_cache
+
+from combo_rules import ComboRules
+
+# Menu groups used by the meal deal check
+MEAL_DEAL_MAINS = ["Big Mac", "Quarter Pounder", "McChicken", "Filet-O-Fish"]
+MEAL_DEAL_SIDES = ["French Fries", "Apple Slices", "Side Salad"]
+MEAL_DEAL_DRINKS = ["Coke", "Sprite", "Diet Coke", "Water", "Coffee"]
+
+MEAL_DEAL_RULES = ComboRules(
+    groups={"main": MEAL_DEAL_MAINS, "side": MEAL_DEAL_SIDES, "drink": MEAL_DEAL_DRINKS},
+    combos={"Meal Deal": ["main", "side", "drink"]},
+)
+
 def calculate_tax(subtotal, tax_rate=0.08):
     """
     Calculate the tax amount based on subtotal and tax rate.
@@ -49,12 +64,80 @@ def is_meal_deal_eligible(items):
     Returns:
         bool: True if eligible for a meal deal, False otherwise
     """
-    main_items = ["Big Mac", "Quarter Pounder", "McChicken", "Filet-O-Fish"]
-    sides = ["French Fries", "Apple Slices", "Side Salad"]
-    drinks = ["Coke", "Sprite", "Diet Coke", "Water", "Coffee"]
+    return MEAL_DEAL_RULES.matches(items, "Meal Deal")
+
+
+# Integer cents pricing
+#
+# The functions below do the same job as the float versions above, but every
+# amount is a whole number of cents (599 means $5.99), so adding amounts up
+# never drifts. A percentage can still produce a fraction of a cent, which is
+# rounded half to even (banker's rounding) at the point it is applied.
+
+def to_cents(amount):
+    """
+    Convert a price in dollars to a whole number of cents.
     
-    has_main = any(item in main_items for item in items)
-    has_side = any(item in sides for item in items)
-    has_drink = any(item in drinks for item in items)
+    Args:
+        amount (float): The amount in dollars, e.g. 5.99
+        
+    Returns:
+        int: The amount in cents, e.g. 599
+    """
+    return round(amount * 100)
+
+@lru_cache(maxsize=None)
+def _exact_ratio(rate):
+    """Return a rate such as 0.08 as an exact (numerator, denominator) pair"""
+    fraction = Fraction(str(rate))
+    return fraction.numerator, fraction.denominator
+
+def _round_half_even(numerator, denominator):
+    """Divide two integers, rounding half to even"""
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder * 2 > denominator or (remainder * 2 == denominator and quotient % 2 == 1):
+        quotient += 1
+    return quotient
+
+def calculate_tax_cents(subtotal_cents, tax_rate=0.08):
+    """
+    Calculate the tax amount in cents, rounding half to even.
     
-    return has_main and has_side and has_drink
+    Args:
+        subtotal_cents (int): The pre-tax amount in cents
+        tax_rate (float): The tax rate (default: 8%)
+        
+    Returns:
+        int: The tax amount in cents
+    """
+    numerator, denominator = _exact_ratio(tax_rate)
+    return _round_half_even(subtotal_cents * numerator, denominator)
+
+def format_currency_cents(cents):
+    """
+    Format an amount in cents as currency with $ symbol and 2 decimal places.
+    
+    Args:
+        cents (int): The amount in cents
+        
+    Returns:
+        str: Formatted currency string
+    """
+    sign = "-" if cents < 0 else ""
+    dollars, cents = divmod(abs(cents), 100)
+    return f"${sign}{dollars}.{cents:02d}"
+
+def apply_discount_cents(subtotal_cents, discount_percentage):
+    """
+    Apply a percentage discount to a subtotal in cents.
+    
+    Args:
+        subtotal_cents (int): The pre-discount amount in cents
+        discount_percentage (float): Discount percentage (e.g., 10 for 10%)
+        
+    Returns:
+        int: Discounted amount in cents
+    """
+    numerator, denominator = _exact_ratio(discount_percentage)
+    discount_amount = _round_half_even(subtotal_cents * numerator, denominator * 100)
+    return subtotal_cents - discount_amount
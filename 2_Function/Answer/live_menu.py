@@ -0,0 +1,223 @@
+"""
+Hot-Reloadable Menu
+
+MENU is changed in place by set_menu_price(), so changing prices while orders
+are being taken means either a restart or orders that see half of a price
+update. LiveMenu keeps every published menu as a MenuVersion that never
+changes after it is made:
+
+    - current() returns the latest MenuVersion; it is one attribute read, with
+      no lock, because publishing swaps the whole MenuVersion in one assignment
+    - publish() and reload() take a lock so only one new version is made at a
+      time, and tell subscribed callbacks about it
+    - start_order() pins the current MenuVersion to a new PinnedOrder, which
+      prices the order with that version even if a newer one is published
+      before the order is finished
+    - reload_if_changed() and watch() load a menu snapshot file (see
+      save_menu_snapshot()) again when it changes on disk
+
+Example:
+    live = LiveMenu.from_file("menu.snapshot")
+    live.watch("menu.snapshot")
+    order = live.start_order()
+    order.add("Big Mac", 2)
+    print(order.receipt())
+"""
+
+import importlib
+import os
+import threading
+from types import MappingProxyType
+
+from extension import to_cents
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+class MenuVersion:
+    """One published menu: read-only prices and the version number"""
+    __slots__ = ("version", "prices", "prices_cents", "source")
+
+    def __init__(self, version, prices, source=None):
+        """
+        Create a menu version.
+
+        Args:
+            version (int): Version number, one higher than the version it replaces
+            prices (dict): Item name to price
+            source (str): File it was loaded from, if any
+        """
+        self.version = version
+        self.prices = MappingProxyType(dict(prices))
+        self.prices_cents = MappingProxyType({item: to_cents(price) for item, price in prices.items()})
+        self.source = source
+
+class PinnedOrder:
+    """An order priced with the menu version that was current when it started"""
+
+    def __init__(self, menu):
+        """
+        Start an order.
+
+        Args:
+            menu (MenuVersion): Menu version to price the order with
+        """
+        self.menu = menu
+        self.items = []  # {"name", "quantity"} dicts, like take_order() returns
+
+    def add(self, name, quantity):
+        """
+        Add an item to the order.
+
+        Args:
+            name (str): The item name
+            quantity (int): How many
+
+        Raises:
+            KeyError: If the item is not on this version of the menu
+            ValueError: If the quantity is not positive
+        """
+        if name not in self.menu.prices:
+            raise KeyError(f"{name!r} is not on menu version {self.menu.version}")
+        if quantity <= 0:
+            raise ValueError(f"quantity must be positive, got {quantity}")
+        self.items.append({"name": name, "quantity": quantity})
+
+    def calculate_total(self):
+        """Return (subtotal, tax, discount, total) as floats, like calculate_total()"""
+        return task.calculate_total(self.items, self.menu.prices)
+
+    def calculate_total_cents(self):
+        """Return (subtotal, tax, discount, total) in cents, like calculate_total_cents()"""
+        return task.calculate_total_cents(self.items, self.menu.prices_cents)
+
+    def receipt(self, in_cents=True):
+        """Return the receipt text, priced with the pinned menu version"""
+        if in_cents:
+            details = self.calculate_total_cents()
+            return task.generate_receipt(self.items, details, True, self.menu.prices_cents)
+        return task.generate_receipt(self.items, self.calculate_total(), False, self.menu.prices)
+
+class LiveMenu:
+    """A menu that can be replaced while orders are running, read without a lock"""
+
+    def __init__(self, prices=None, source=None):
+        """
+        Create a live menu.
+
+        Args:
+            prices (dict): Item name to price of version 1, MENU by default
+            source (str): File the prices came from, if any
+        """
+        self._current = MenuVersion(1, task.MENU if prices is None else prices, source)
+        self._write_lock = threading.Lock()
+        self._callbacks = []
+        self._file_stamps = {}  # path: (modification time, size) when it was last loaded
+        self.last_error = None  # Error of the last reload that failed, the old version is kept
+        self.last_callback_error = None  # Last error raised by a subscribed callback
+
+    @classmethod
+    def from_file(cls, path):
+        """Create a live menu whose version 1 is read from a snapshot file"""
+        stat = os.stat(path)
+        live = cls(task.read_menu_snapshot(path), path)
+        live._file_stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return live
+
+    def current(self):
+        """Return the latest MenuVersion"""
+        return self._current
+
+    def start_order(self):
+        """Return a PinnedOrder using the latest MenuVersion"""
+        return PinnedOrder(self._current)
+
+    def publish(self, prices, source=None):
+        """
+        Make a new menu version current.
+
+        Orders already started keep the version they pinned. Callbacks are
+        called as callback(old_version, new_version) in the publishing thread;
+        an error in one is kept in last_callback_error and does not stop the
+        others or undo the publish.
+
+        Args:
+            prices (dict): Item name to price
+            source (str): File the prices came from, if any
+
+        Returns:
+            MenuVersion: The new version
+        """
+        with self._write_lock:
+            old = self._current
+            new = MenuVersion(old.version + 1, prices, source)
+            self._current = new
+            for callback in self._callbacks:
+                try:
+                    callback(old, new)
+                except Exception as error:
+                    self.last_callback_error = error
+        return new
+
+    def subscribe(self, callback):
+        """Call callback(old_version, new_version) after every publish"""
+        with self._write_lock:
+            self._callbacks.append(callback)
+
+    def reload(self, path):
+        """
+        Publish the prices in a snapshot file.
+
+        Args:
+            path (str): File written by save_menu_snapshot() or menu_snapshot.save_menu()
+
+        Returns:
+            MenuVersion: The new version
+        """
+        stat = os.stat(path)
+        version = self.publish(task.read_menu_snapshot(path), path)
+        self._file_stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return version
+
+    def reload_if_changed(self, path):
+        """
+        Reload a snapshot file if it changed since it was last loaded.
+
+        A file that cannot be read, for whatever reason, is skipped and its
+        error kept in last_error, so a bad file never replaces a good menu.
+
+        Args:
+            path (str): Snapshot file
+
+        Returns:
+            bool: True if a new version was published
+        """
+        try:
+            stat = os.stat(path)
+            if self._file_stamps.get(path) == (stat.st_mtime_ns, stat.st_size):
+                return False
+            self.reload(path)
+        except Exception as error:
+            self.last_error = error
+            return False
+        self.last_error = None
+        return True
+
+    def watch(self, path, interval=1.0):
+        """
+        Check a snapshot file for changes in a background thread.
+
+        Args:
+            path (str): Snapshot file
+            interval (float): Seconds between checks
+
+        Returns:
+            threading.Event: Set it to stop watching
+        """
+        stop = threading.Event()
+
+        def poll():
+            while not stop.wait(interval):
+                self.reload_if_changed(path)
+
+        threading.Thread(target=poll, name=f"watch {path}", daemon=True).start()
+        return stop
@@ -0,0 +1,31 @@
+"""
+Menu Search
+
+Suggests menu items when a customer types a name that is not on the menu, for
+example "big mc" or "quater pounder". It uses the SearchIndex from
+3_Class_and_OOP/food_search.py, imported the first time a suggestion is
+needed, and builds it again only when MENU_VERSION changes.
+"""
+
+from oop_modules import import_oop_module
+
+_cached_index = None  # (menu version, SearchIndex)
+
+def suggest_items(query, menu, menu_version, limit=3):
+    """
+    Find menu items whose names match the query by prefix or by spelling.
+    
+    Args:
+        query (str): What the customer typed
+        menu (dict): Item name to price
+        menu_version (int): Version of the menu, the index is rebuilt when it changes
+        limit (int): Maximum number of suggestions
+        
+    Returns:
+        list: Item names, best match first
+    """
+    global _cached_index  # Declare that we are using the global variable _cached_index
+    if _cached_index is None or _cached_index[0] != menu_version:
+        search_index = import_oop_module("food_search").SearchIndex(menu)
+        _cached_index = (menu_version, search_index)
+    return _cached_index[1].search(query, limit)
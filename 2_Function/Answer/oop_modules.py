@@ -0,0 +1,48 @@
+"""
+Lesson 3 Modules
+
+A few answers reuse code from 3_Class_and_OOP: menu_search.py uses its
+SearchIndex, and the menu snapshot functions use menu_snapshot.py.
+import_oop_module() loads those files by path and registers them under their
+own names, so the answers can use them without adding 3_Class_and_OOP to
+sys.path for every other import.
+"""
+
+import importlib.util
+import os
+import sys
+
+OOP_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "3_Class_and_OOP")
+
+# The 3_Class_and_OOP modules each module imports, loaded before it
+DEPENDENCIES = {
+    "food_search": (),
+    "2_An_example": ("food_search",),
+    "compact_catalog": ("2_An_example",),
+    "menu_snapshot": ("2_An_example", "compact_catalog"),
+}
+
+def import_oop_module(name):
+    """
+    Import a module from 3_Class_and_OOP, or return it if it is already imported.
+    
+    Args:
+        name (str): Module name, a key of DEPENDENCIES
+        
+    Returns:
+        module: The imported module
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    for dependency in DEPENDENCIES[name]:
+        import_oop_module(dependency)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(OOP_DIRECTORY, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
@@ -0,0 +1,341 @@
+"""
+Bulk Order Import and Export
+
+Orders are lists of {"name", "quantity"} dicts, with an optional
+"modifications" list of modification names (see order_from_menu()). This
+module saves and loads many of them at once in three formats:
+
+    CSV     - one row per order line: order,name,quantity,modifications
+              (modifications joined with ";"); an empty order is one row
+              with only its order number, so it is read back too
+    JSONL   - one order per line, as a JSON list of item dicts
+    columns - a binary file of flat arrays, like the ones batch_pricing uses:
+
+        header          magic b"ORDERCOL", format version, number of orders,
+                        lines, item names, modification names and bitset words
+        item names      NUL-separated UTF-8
+        modifier names  NUL-separated UTF-8
+        offsets         int64, where each order starts (plus the end of the last)
+        item_ids        uint32, index into the item names for every line
+        quantities      uint32, quantity of every line
+        modifier_bits   uint64 words per line, bit i set when modification i is chosen
+
+The CSV and JSONL readers are generators, so files of any size can be read one
+order at a time. OrderColumns.price() feeds the columns straight into
+batch_pricing.calculate_totals_encoded() without building any dicts.
+"""
+
+import csv
+import json
+import os
+import struct
+
+import numpy as np
+
+import batch_pricing
+
+MAGIC = b"ORDERCOL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHIQQIIII")  # magic, version, flags, word count, orders, lines, name counts, name bytes
+CSV_FIELDS = ["order", "name", "quantity", "modifications"]
+
+class OrderColumns:
+    """Many orders stored as flat NumPy arrays"""
+
+    def __init__(self, item_names, modifier_names, offsets, item_ids, quantities, modifier_bits):
+        """
+        Create columns from arrays; use encode_orders() or read_columns() to build them.
+
+        Args:
+            item_names (list): Item name of every item ID used in item_ids
+            modifier_names (list): Modification name of every bit in modifier_bits
+            offsets (ndarray): Start of each order, plus the end of the last one
+            item_ids (ndarray): Item ID of every line
+            quantities (ndarray): Quantity of every line
+            modifier_bits (ndarray): 2-D array of uint64 bitset words, one row per line
+        """
+        self.item_names = item_names
+        self.modifier_names = modifier_names
+        self.offsets = offsets
+        self.item_ids = item_ids
+        self.quantities = quantities
+        self.modifier_bits = modifier_bits
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def line_modifications(self, line):
+        """Return the modification names chosen on one line."""
+        names = []
+        for word_index, word in enumerate(self.modifier_bits[line].tolist()):
+            while word:
+                low_bit = word & -word
+                names.append(self.modifier_names[word_index * 64 + low_bit.bit_length() - 1])
+                word ^= low_bit
+        return names
+
+    def orders(self):
+        """Yield the orders as lists of item dicts, with modifications in bit order."""
+        offsets = self.offsets.tolist()
+        item_ids = self.item_ids.tolist()
+        quantities = self.quantities.tolist()
+        has_bits = self.modifier_bits.any(axis=1).tolist() if self.modifier_bits.shape[1] else [False] * len(item_ids)
+        for start, end in zip(offsets, offsets[1:]):
+            order = []
+            for line in range(start, end):
+                item = {"name": self.item_names[item_ids[line]], "quantity": quantities[line]}
+                if has_bits[line]:
+                    item["modifications"] = self.line_modifications(line)
+                order.append(item)
+            yield order
+
+    def price(self, menu=batch_pricing.MENU):
+        """
+        Price every order with batch_pricing, without building order dicts.
+
+        Args:
+            menu (dict): Item name to price
+
+        Returns:
+            tuple: (subtotal, tax, discount, total) as float arrays, one entry per order
+
+        Raises:
+            KeyError: If an item is not on the menu
+        """
+        item_ids, prices, group_masks = batch_pricing.build_item_table(menu)
+        menu_ids = np.array([item_ids[name] for name in self.item_names], dtype=np.int64)
+        return batch_pricing.calculate_totals_encoded(
+            menu_ids[self.item_ids], self.quantities.astype(np.int64), self.offsets, prices, group_masks)
+
+def encode_orders(orders, item_names=(), modifier_names=()):
+    """
+    Convert orders of item dicts into OrderColumns.
+
+    Args:
+        orders: Iterable of orders, each a list of item dicts
+        item_names: Item names to number first, e.g. the menu, so files share IDs
+        modifier_names: Modification names to number first
+
+    Returns:
+        OrderColumns: The orders as flat arrays
+    """
+    item_ids = {name: i for i, name in enumerate(item_names)}
+    modifier_bits = {name: i for i, name in enumerate(modifier_names)}
+    line_item_ids = []
+    quantities = []
+    line_masks = []
+    offsets = [0]
+    for order in orders:
+        for item in order:
+            name = item["name"]
+            item_id = item_ids.get(name)
+            if item_id is None:
+                item_id = item_ids[name] = len(item_ids)
+            mask = 0
+            for modification in item.get("modifications", ()):
+                bit = modifier_bits.get(modification)
+                if bit is None:
+                    bit = modifier_bits[modification] = len(modifier_bits)
+                mask |= 1 << bit
+            line_item_ids.append(item_id)
+            quantities.append(item["quantity"])
+            line_masks.append(mask)
+        offsets.append(len(line_item_ids))
+
+    words = (len(modifier_bits) + 63) // 64
+    bits = np.zeros((len(line_masks), words), dtype=np.uint64)
+    for word_index in range(words):
+        shift = 64 * word_index
+        bits[:, word_index] = np.array([(mask >> shift) & 0xFFFFFFFFFFFFFFFF for mask in line_masks], dtype=np.uint64)
+    return OrderColumns(list(item_ids), list(modifier_bits), np.array(offsets, dtype=np.int64),
+                        np.array(line_item_ids, dtype=np.uint32), np.array(quantities, dtype=np.uint32), bits)
+
+def order_from_menu(order):
+    """
+    Convert a Menu.current_order from 3_Class_and_OOP into a list of item dicts.
+
+    Args:
+        order (list): OrderLine objects
+
+    Returns:
+        list: {"name", "quantity", "modifications"} dicts, one per line
+    """
+    return [{"name": line.name, "quantity": 1, "modifications": list(line.selected_modifications)}
+            for line in order]
+
+def write_csv(orders, file):
+    """
+    Write orders as CSV rows, one per order line.
+
+    Args:
+        orders: Iterable of orders, each a list of item dicts
+        file: Text file opened with newline=""
+
+    Returns:
+        int: Number of orders written
+    """
+    writer = csv.writer(file)
+    writer.writerow(CSV_FIELDS)
+    count = 0
+    for count, order in enumerate(orders, 1):
+        if not order:
+            # Keep the order number, so orders read back line up with anything paired with them
+            writer.writerow((count, "", "", ""))
+            continue
+        writer.writerows([(count, item["name"], item["quantity"], ";".join(item.get("modifications", ())))
+                          for item in order])
+    return count
+
+def read_csv(file):
+    """
+    Read orders written by write_csv(), one at a time.
+
+    Args:
+        file: Text file opened with newline=""
+
+    Yields:
+        list: Item dicts of one order
+    """
+    reader = csv.reader(file)
+    next(reader, None)  # Header
+    current_id = None
+    order = []
+    for order_id, name, quantity, modifications in reader:
+        if order_id != current_id:
+            if current_id is not None:
+                yield order
+            current_id = order_id
+            order = []
+        if not name and not quantity:
+            continue  # The row of an empty order
+        item = {"name": name, "quantity": int(quantity)}
+        if modifications:
+            item["modifications"] = modifications.split(";")
+        order.append(item)
+    if current_id is not None:
+        yield order
+
+def write_jsonl(orders, file):
+    """
+    Write orders as JSON lines, one order per line.
+
+    Args:
+        orders: Iterable of orders, each a list of item dicts
+        file: Text file
+
+    Returns:
+        int: Number of orders written
+    """
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    count = 0
+    for count, order in enumerate(orders, 1):
+        file.write(encoder.encode(order) + "\n")
+    return count
+
+def read_jsonl(file):
+    """
+    Read orders written by write_jsonl(), one at a time.
+
+    Args:
+        file: Text file
+
+    Yields:
+        list: Item dicts of one order
+    """
+    decode = json.JSONDecoder().decode
+    for line in file:
+        if line.strip():
+            yield decode(line)
+
+def _name_table(names):
+    """Return names as NUL-separated UTF-8 bytes."""
+    for name in names:
+        if "\0" in name:
+            raise ValueError(f"Names cannot contain NUL: {name!r}")
+    return "\0".join(names).encode("utf-8")
+
+def write_columns(columns, path):
+    """
+    Save OrderColumns to a binary file.
+
+    Args:
+        columns (OrderColumns): Orders to save
+        path (str): File to write
+
+    Returns:
+        None
+    """
+    item_table = _name_table(columns.item_names)
+    modifier_table = _name_table(columns.modifier_names)
+    words = columns.modifier_bits.shape[1]
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, words, len(columns), len(columns.item_ids),
+                            len(columns.item_names), len(columns.modifier_names), len(item_table), len(modifier_table)))
+        f.write(item_table)
+        f.write(modifier_table)
+        f.write(columns.offsets.astype("<i8").tobytes())
+        f.write(columns.item_ids.astype("<u4").tobytes())
+        f.write(columns.quantities.astype("<u4").tobytes())
+        f.write(columns.modifier_bits.astype("<u8").tobytes())
+
+def read_columns(path):
+    """
+    Load OrderColumns saved by write_columns().
+
+    Args:
+        path (str): File to read
+
+    Returns:
+        OrderColumns: The saved orders
+
+    Raises:
+        ValueError: If the file is not an order columns file of this version, is truncated,
+                    or has offsets, item IDs or modification bits that point outside its tables
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an order columns file")
+        (_, version, _, words, order_count, line_count,
+         item_count, modifier_count, item_bytes, modifier_bytes) = HEADER.unpack(header)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported order columns format version {version}")
+        # Check the counts against the file size before they size any array
+        expected_size = (HEADER.size + item_bytes + modifier_bytes + 8 * (order_count + 1)
+                         + line_count * (8 + 8 * words))
+        if os.fstat(f.fileno()).st_size < expected_size:
+            raise ValueError(f"{path} is truncated")
+        if modifier_count > words * 64:
+            raise ValueError(f"{path} has {modifier_count} modifications but only {words} bit words")
+        item_table = f.read(item_bytes)
+        modifier_table = f.read(modifier_bytes)
+        offsets = np.fromfile(f, dtype="<i8", count=order_count + 1)
+        item_ids = np.fromfile(f, dtype="<u4", count=line_count)
+        quantities = np.fromfile(f, dtype="<u4", count=line_count)
+        modifier_bits = np.fromfile(f, dtype="<u8", count=line_count * words)
+    # np.fromfile() and read() return what is there, so a truncated file gives short arrays
+    if (len(item_table) != item_bytes or len(modifier_table) != modifier_bytes or len(offsets) != order_count + 1
+            or len(item_ids) != line_count or len(quantities) != line_count
+            or len(modifier_bits) != line_count * words):
+        raise ValueError(f"{path} is truncated")
+    try:
+        item_names = item_table.decode("utf-8").split("\0") if item_count else []
+        modifier_names = modifier_table.decode("utf-8").split("\0") if modifier_count else []
+    except UnicodeDecodeError:
+        raise ValueError(f"{path} has a damaged name table") from None
+    if len(item_names) != item_count or len(modifier_names) != modifier_count:
+        raise ValueError(f"{path} has a damaged name table")
+    # Every later read indexes with these, so a damaged file must not get past here
+    if offsets[0] != 0 or offsets[-1] != line_count or np.any(np.diff(offsets) < 0):
+        raise ValueError(f"{path} has order offsets that are not in order or do not cover its {line_count} lines")
+    if line_count and item_ids.max() >= item_count:
+        raise ValueError(f"{path} has an item ID {item_ids.max()} out of range (only {item_count} items)")
+    modifier_bits = modifier_bits.reshape(line_count, words)
+    if modifier_count < words * 64 and line_count:
+        # Bits past the last modification name must be clear
+        spare = np.zeros(words, dtype=np.uint64)
+        for bit in range(modifier_count, words * 64):
+            spare[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        if np.any(modifier_bits & spare):
+            raise ValueError(f"{path} has modification bits out of range (only {modifier_count} modifications)")
+    return OrderColumns(item_names, modifier_names, offsets, item_ids, quantities, modifier_bits)
@@ -0,0 +1,104 @@
+"""
+Order Load Generator
+
+Opens many concurrent sessions to order_server.py, sends random orders and
+measures how many orders per second the server handles and how long each
+order takes from its first line to the last line of its receipt.
+
+Usage:
+    python order_load_client.py --port 8765 --sessions 100 --orders 50
+    python order_load_client.py --unix /tmp/orders.sock
+"""
+
+import argparse
+import asyncio
+import importlib
+import random
+import time
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+async def run_session(connect, orders, latencies, seed):
+    """
+    Send orders over one connection and record the latency of each.
+
+    Args:
+        connect: Coroutine function that opens a (reader, writer) pair
+        orders (int): Number of orders to send
+        latencies (list): Latencies in seconds are appended here
+        seed (int): Random seed for the order contents
+    """
+    rng = random.Random(seed)
+    names = list(task.MENU)
+    reader, writer = await connect()
+    try:
+        for _ in range(orders):
+            lines = [f"{rng.choice(names)}\t{rng.randint(1, 5)}\n" for _ in range(rng.randint(1, 6))]
+            start = time.perf_counter()
+            writer.write(("".join(lines) + "done\n").encode())
+            await writer.drain()
+            for _ in lines:
+                reply = await reader.readline()
+                if not reply.startswith(b"OK"):
+                    raise RuntimeError(f"server rejected an order line: {reply.decode().strip()}")
+            header = await reader.readline()
+            for _ in range(int(header.split()[1])):
+                await reader.readline()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+def percentile(sorted_values, fraction):
+    """Return the value below which the given fraction of sorted_values fall."""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+async def run_load(connect, sessions, orders):
+    """
+    Run concurrent sessions and summarise the results.
+
+    Args:
+        connect: Coroutine function that opens a (reader, writer) pair
+        sessions (int): Number of concurrent sessions
+        orders (int): Orders per session
+
+    Returns:
+        dict: orders, seconds, orders_per_second, p50_ms and p99_ms
+    """
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(connect, orders, latencies, seed) for seed in range(sessions)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "orders": len(latencies),
+        "seconds": seconds,
+        "orders_per_second": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+def main():
+    """Run the load generator from the command line."""
+    parser = argparse.ArgumentParser(description="Load generator for order_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="connect to a Unix socket path instead of TCP")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--orders", type=int, default=50, help="orders per session")
+    args = parser.parse_args()
+
+    if args.unix:
+        connect = lambda: asyncio.open_unix_connection(args.unix)
+    else:
+        connect = lambda: asyncio.open_connection(args.host, args.port)
+
+    result = asyncio.run(run_load(connect, args.sessions, args.orders))
+    print(f"Orders:        {result['orders']}")
+    print(f"Time:          {result['seconds']:.2f} s")
+    print(f"Orders/second: {result['orders_per_second']:.0f}")
+    print(f"p50 latency:   {result['p50_ms']:.2f} ms")
+    print(f"p99 latency:   {result['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Order Intake Server
+
+take_order() waits on input() for one customer at a time. This server uses
+asyncio so one process can take orders from many customers at once, over TCP
+or a Unix socket. It checks items and quantities with the same rules as
+take_order() (is_menu_item() and parse_quantity()) and prices finished orders
+with calculate_total() and generate_receipt().
+
+Protocol (one line per message, UTF-8):
+    client: <item name>\t<quantity>     server: OK
+                                        server: ERROR <reason and suggestions>
+    client: done                        server: RECEIPT <number of lines>
+                                        server: <the receipt lines>
+After a receipt the session starts a new order. Closing the connection ends
+the session. A line that is not UTF-8, or longer than the stream limit
+(64 KiB), gets an ERROR reply and is skipped; the order stays as it was.
+
+Usage:
+    python order_server.py --port 8765
+    python order_server.py --unix /tmp/orders.sock
+"""
+
+import argparse
+import asyncio
+import importlib
+
+from menu_search import suggest_items
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+def handle_line(order, line):
+    """
+    Apply one client line to the current order.
+
+    Args:
+        order (list): The order being taken, changed in place
+        line (str): The line sent by the client, without the new line
+
+    Returns:
+        str: The reply to send back
+    """
+    if line.lower() == 'done':
+        financial_details = task.calculate_total(order)
+        receipt = task.generate_receipt(order, financial_details)
+        order.clear()
+        line_count = len(receipt.splitlines())
+        return f"RECEIPT {line_count}\n{receipt}\n"
+
+    item, _, quantity = line.partition("\t")
+    if not task.is_menu_item(item):
+        suggestions = suggest_items(item, task.MENU, task.MENU_VERSION)
+        if suggestions:
+            return f"ERROR Item not on menu, did you mean: {', '.join(suggestions)}?\n"
+        return "ERROR Item not on menu\n"
+    try:
+        quantity = task.parse_quantity(quantity)
+    except ValueError:
+        return "ERROR Invalid quantity\n"
+    order.append({"name": item, "quantity": quantity})
+    return "OK\n"
+
+async def read_line(reader):
+    """
+    Read the next line from a client.
+
+    Args:
+        reader (asyncio.StreamReader): The client stream
+
+    Returns:
+        bytes: The line, b"" once the client has closed, or None if the line
+               was longer than the stream limit (it is read and thrown away)
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial  # A last line without a new line, or b"" at the end
+    except asyncio.LimitOverrunError as error:
+        # Throw away the long line piece by piece, up to and including its new line
+        while True:
+            await reader.readexactly(error.consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return b""
+            except asyncio.LimitOverrunError as next_error:
+                error = next_error
+
+async def handle_session(reader, writer):
+    """Take orders from one connected client until it disconnects."""
+    order = []
+    try:
+        while True:
+            line = await read_line(reader)
+            if line is None:
+                reply = "ERROR Line too long\n"
+            elif not line:
+                break
+            else:
+                try:
+                    reply = handle_line(order, line.decode("utf-8").rstrip("\r\n"))
+                except UnicodeDecodeError:
+                    reply = "ERROR Line is not valid UTF-8\n"
+            writer.write(reply.encode())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(host="127.0.0.1", port=8765, unix_path=None):
+    """
+    Run the order server until it is cancelled.
+
+    Args:
+        host (str): Address to listen on for TCP
+        port (int): Port to listen on for TCP
+        unix_path (str): Listen on this Unix socket instead of TCP
+    """
+    if unix_path:
+        server = await asyncio.start_unix_server(handle_session, path=unix_path)
+    else:
+        server = await asyncio.start_server(handle_session, host, port)
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Start the order server from the command line."""
+    parser = argparse.ArgumentParser(description="McDonald's order intake server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on a Unix socket path instead of TCP")
+    args = parser.parse_args()
+    print(f"Taking orders on {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Cached Receipt Rendering
+
+generate_receipt() and display_menu() build every padded name, currency string
+and separator line again for every order. ReceiptRenderer builds the parts that
+only depend on the menu once per menu version (MENU_VERSION goes up whenever
+a price in MENU changes, through set_menu_price() or a direct write like
+MENU["Big Mac"] = 6.49) and keeps an LRU cache of formatted amounts and
+receipt lines. The text it returns is the same as generate_receipt().
+"""
+
+import importlib
+from functools import lru_cache
+
+from extension import format_currency, format_currency_cents
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+# Parts of a receipt that never change
+RECEIPT_HEADER = "\n".join([
+    "===== McDonald's Receipt =====",
+    "Item".ljust(20) + "Qty".ljust(10) + "Price".rjust(10),
+    "-" * 40,
+])
+RECEIPT_SEPARATOR = "-" * 40
+SUBTOTAL_LABEL = f"{'Subtotal:':.<30} "
+DISCOUNT_LABEL = f"{'Discount:':.<30} -"
+TAX_LABEL = f"{'Tax:':.<30} "
+TOTAL_LABEL = f"{'Total:':.<30} "
+RECEIPT_FOOTER = "\n".join([
+    "=" * 40,
+    "Thank you for choosing McDonald's!",
+])
+
+class ReceiptRenderer:
+    """Render receipts and the menu using tables cached per menu version"""
+
+    def __init__(self, cache_size=4096):
+        """
+        Create a renderer.
+
+        Args:
+            cache_size (int): How many formatted amounts and receipt lines to keep
+        """
+        self.cache_size = cache_size
+        self.format_amount = lru_cache(maxsize=cache_size)(format_currency)
+        self.format_amount_cents = lru_cache(maxsize=cache_size)(format_currency_cents)
+        self._version = None
+
+    def _refresh(self):
+        """Rebuild the cached tables if a menu price has changed."""
+        if self._version == task.MENU_VERSION:
+            return
+        self._version = task.MENU_VERSION
+
+        # Pre-padded item name column and pre-formatted unit prices
+        self.padded_names = {item: item.ljust(20) for item in task.MENU}
+        self.unit_prices = {item: format_currency(price) for item, price in task.MENU.items()}
+
+        self._line = self._line_renderer(dict(task.MENU), self.format_amount)
+        self._line_cents = self._line_renderer(dict(task.MENU_CENTS), self.format_amount_cents)
+
+        self.menu_text = "\n".join(
+            ["\n===== McDonald's Menu =====", "Item".ljust(20) + "Price", "-" * 30]
+            + [f"{self.padded_names[item]} {self.unit_prices[item]}" for item in task.MENU]
+            + ["=" * 30]
+        )
+
+    def _line_renderer(self, prices, format_amount):
+        """Return a cached function that renders one receipt line."""
+        padded_names = self.padded_names
+
+        @lru_cache(maxsize=self.cache_size)
+        def render_line(name, quantity):
+            price = prices[name] * quantity
+            return f"{padded_names[name]} {str(quantity).ljust(10)} {format_amount(price).rjust(10)}"
+
+        return render_line
+
+    def render(self, order, financial_details, in_cents=False):
+        """
+        Generate a formatted receipt, the same text as generate_receipt().
+
+        Args:
+            order (list): List of dictionaries containing item names and quantities
+            financial_details (tuple): (subtotal, tax, discount, total)
+            in_cents (bool): True if financial_details came from calculate_total_cents()
+
+        Returns:
+            str: Formatted receipt text
+        """
+        self._refresh()
+        subtotal, tax, discount, total = financial_details
+        render_line = self._line_cents if in_cents else self._line
+        format_amount = self.format_amount_cents if in_cents else self.format_amount
+
+        receipt = [RECEIPT_HEADER]
+        for item in order:
+            receipt.append(render_line(item["name"], item["quantity"]))
+        receipt.append(RECEIPT_SEPARATOR)
+        receipt.append(SUBTOTAL_LABEL + format_amount(subtotal))
+        if discount > 0:
+            receipt.append(DISCOUNT_LABEL + format_amount(discount))
+        receipt.append(TAX_LABEL + format_amount(tax))
+        receipt.append(TOTAL_LABEL + format_amount(total))
+        receipt.append(RECEIPT_FOOTER)
+        return "\n".join(receipt)
+
+    def render_menu(self):
+        """
+        Return the menu text that display_menu() prints.
+
+        Returns:
+            str: Formatted menu text
+        """
+        self._refresh()
+        return self.menu_text
+
+    def display_menu(self):
+        """
+        Display the McDonald's menu with prices from the cache.
+
+        Returns:
+            None
+        """
+        print(self.render_menu())
+
+    def write_receipts(self, orders, financial_details_list, file, in_cents=False):
+        """
+        Render many receipts into one buffer and write it with a single call.
+
+        The output is the same as printing each receipt in turn.
+
+        Args:
+            orders (list): List of orders
+            financial_details_list (list): (subtotal, tax, discount, total) of each order
+            file: An open text file, e.g. sys.stdout
+            in_cents (bool): True if the financial details are in cents
+
+        Returns:
+            int: Number of receipts written
+        """
+        buffer = []
+        for order, financial_details in zip(orders, financial_details_list):
+            buffer.append(self.render(order, financial_details, in_cents))
+            buffer.append("\n")
+        file.write("".join(buffer))
+        return len(buffer) // 2
@@ -0,0 +1,231 @@
+"""
+Streaming Sales Analytics
+
+SalesAggregator reads orders one at a time and keeps running totals, so a day
+of orders never has to be in memory at once:
+
+    - quantity, revenue and number of lines of every item
+    - the same rolled up per category
+    - how often each modification is chosen on the lines of each item
+      (its attach rate)
+    - the top-K bestsellers, picked with a heap
+    - the sum of the financial details of every order, when they are given
+
+Memory grows with the number of distinct items and modifications, never with
+the number of orders. Aggregators built on different shards of orders can be
+combined with merge(), and give the same result as one aggregator that saw
+every order, because every total is a whole number of cents or units.
+"""
+
+import heapq
+import importlib
+
+import numpy as np
+
+from extension import to_cents
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+# Index of each total in the per-item and per-category lists
+QUANTITY, REVENUE, LINES = range(3)
+
+class SalesAggregator:
+    """One-pass, mergeable sales totals per item, category and modification"""
+
+    def __init__(self, categories=None, prices=None, modifier_prices=None, top_k=10):
+        """
+        Create an empty aggregator.
+
+        Args:
+            categories (dict): Item name to category name, items not in it count as "Other"
+            prices (dict): Item name to price in cents, MENU_CENTS by default
+            modifier_prices (dict): Item name to {modification: price in cents}
+            top_k (int): Number of bestsellers top_items() returns by default
+        """
+        self.categories = categories or {}
+        self.prices = task.MENU_CENTS if prices is None else prices
+        self.modifier_prices = modifier_prices or {}
+        self.top_k = top_k
+        self.item_totals = {}  # item name: [quantity, revenue in cents, lines]
+        self.modifier_lines = {}  # (item name, modification): lines it was chosen on
+        self.order_count = 0
+        self.order_totals = [0, 0, 0, 0]  # subtotal, tax, discount, total of orders given with details
+
+    @classmethod
+    def for_menu(cls, menu, top_k=10):
+        """
+        Create an aggregator for a Menu from 3_Class_and_OOP.
+
+        Categories, base prices and modification prices are read from the menu.
+        If an item is in several categories, the first one is used.
+
+        Args:
+            menu: Menu object
+            top_k (int): Number of bestsellers top_items() returns by default
+
+        Returns:
+            SalesAggregator: An empty aggregator
+        """
+        categories, prices, modifier_prices = {}, {}, {}
+        for category_name, category in menu.categories.items():
+            for name, food in category.foods.items():
+                if name not in categories:
+                    categories[name] = category_name
+                    prices[name] = to_cents(food.base_price)
+                    modifier_prices[name] = {mod: to_cents(price) for mod, price in food.possible_modifications.items()}
+        return cls(categories, prices, modifier_prices, top_k)
+
+    def add_order(self, order, financial_details=None):
+        """
+        Count one order.
+
+        Args:
+            order (list): Item dicts with "name", "quantity" and optional "modifications"
+            financial_details (tuple): (subtotal, tax, discount, total) of the order, in cents
+
+        Returns:
+            None
+        """
+        item_totals = self.item_totals
+        modifier_lines = self.modifier_lines
+        for item in order:
+            name = item["name"]
+            quantity = item["quantity"]
+            revenue = self.prices.get(name, 0)
+            modifications = item.get("modifications")
+            if modifications:
+                extra = self.modifier_prices.get(name, {})
+                for modification in modifications:
+                    key = (name, modification)
+                    modifier_lines[key] = modifier_lines.get(key, 0) + 1
+                    revenue += extra.get(modification, 0)
+            totals = item_totals.get(name)
+            if totals is None:
+                totals = item_totals[name] = [0, 0, 0]
+            totals[QUANTITY] += quantity
+            totals[REVENUE] += revenue * quantity
+            totals[LINES] += 1
+        self.order_count += 1
+        if financial_details is not None:
+            for i, amount in enumerate(financial_details):
+                self.order_totals[i] += amount
+
+    def add_orders(self, orders):
+        """
+        Count every order of a stream, e.g. order_io.read_csv(file).
+
+        Args:
+            orders: Iterable of orders, or of (order, financial_details) pairs
+
+        Returns:
+            SalesAggregator: self, so calls can be chained
+        """
+        for order in orders:
+            if isinstance(order, tuple):
+                self.add_order(*order)
+            else:
+                self.add_order(order)
+        return self
+
+    def add_columns(self, columns):
+        """
+        Count a batch of orders stored as order_io.OrderColumns, a column at a time.
+
+        Args:
+            columns (OrderColumns): Orders, e.g. from order_io.read_columns()
+
+        Returns:
+            SalesAggregator: self, so calls can be chained
+        """
+        item_count = len(columns.item_names)
+        item_ids = columns.item_ids.astype(np.int64)
+        quantities = columns.quantities.astype(np.int64)
+        line_counts = np.bincount(item_ids, minlength=item_count)
+        quantity_totals = np.bincount(item_ids, weights=quantities, minlength=item_count)
+        prices = np.array([self.prices.get(name, 0) for name in columns.item_names], dtype=np.int64)
+        revenues = (quantity_totals * prices).astype(np.int64)
+
+        for bit, modification in enumerate(columns.modifier_names):
+            word = columns.modifier_bits[:, bit // 64]
+            chosen = ((word >> np.uint64(bit % 64)) & np.uint64(1)).astype(bool)
+            if not chosen.any():
+                continue
+            lines_with = np.bincount(item_ids[chosen], minlength=item_count)
+            quantity_with = np.bincount(item_ids[chosen], weights=quantities[chosen], minlength=item_count)
+            for item_id in np.nonzero(lines_with)[0].tolist():
+                name = columns.item_names[item_id]
+                key = (name, modification)
+                self.modifier_lines[key] = self.modifier_lines.get(key, 0) + int(lines_with[item_id])
+                revenues[item_id] += int(quantity_with[item_id]) * self.modifier_prices.get(name, {}).get(modification, 0)
+
+        for item_id in np.nonzero(line_counts)[0].tolist():
+            totals = self.item_totals.setdefault(columns.item_names[item_id], [0, 0, 0])
+            totals[QUANTITY] += int(quantity_totals[item_id])
+            totals[REVENUE] += int(revenues[item_id])
+            totals[LINES] += int(line_counts[item_id])
+        self.order_count += len(columns)
+        return self
+
+    def merge(self, other):
+        """
+        Add the totals of another aggregator, e.g. one that counted another shard.
+
+        Args:
+            other (SalesAggregator): Aggregator to add
+
+        Returns:
+            SalesAggregator: self, so calls can be chained
+        """
+        for name, other_totals in other.item_totals.items():
+            totals = self.item_totals.setdefault(name, [0, 0, 0])
+            for i, value in enumerate(other_totals):
+                totals[i] += value
+        for key, lines in other.modifier_lines.items():
+            self.modifier_lines[key] = self.modifier_lines.get(key, 0) + lines
+        self.order_count += other.order_count
+        for i, amount in enumerate(other.order_totals):
+            self.order_totals[i] += amount
+        return self
+
+    def category_totals(self):
+        """
+        Roll the item totals up per category.
+
+        Returns:
+            dict: Category name to [quantity, revenue in cents, lines]
+        """
+        rollup = {}
+        for name, item_totals in self.item_totals.items():
+            totals = rollup.setdefault(self.categories.get(name, "Other"), [0, 0, 0])
+            for i, value in enumerate(item_totals):
+                totals[i] += value
+        return rollup
+
+    def top_items(self, k=None, by=QUANTITY):
+        """
+        Return the bestsellers.
+
+        Args:
+            k (int): How many, top_k by default
+            by (int): QUANTITY, REVENUE or LINES
+
+        Returns:
+            list: (item name, total) pairs, best first, ties by name
+        """
+        k = self.top_k if k is None else k
+        best = heapq.nsmallest(k, ((-totals[by], name) for name, totals in self.item_totals.items()))
+        return [(name, -negative_total) for negative_total, name in best]
+
+    def attach_rates(self, item=None):
+        """
+        Return how often each modification is chosen on the lines of its item.
+
+        Args:
+            item (str): Only this item, or every item if None
+
+        Returns:
+            dict: (item name, modification) to the fraction of lines it was chosen on
+        """
+        return {(name, modification): lines / self.item_totals[name][LINES]
+                for (name, modification), lines in self.modifier_lines.items()
+                if item is None or name == item}
@@ -0,0 +1,187 @@
+"""
+Parallel Settlement Pipeline
+
+The nightly settlement prices every order with calculate_total(), prints its
+receipt with generate_receipt() and adds up the quantity, revenue, discount and
+tax of every menu item. SettlementPipeline splits a stream of orders into
+shards and settles the shards on several processes:
+
+    - orders are sent to the workers as tuples of (item ID, quantity) pairs,
+      which are much smaller to pickle than lists of dicts
+    - results come back in the same order as the orders went in
+    - the per-item totals of each shard are merged in the parent
+
+Each order is priced by the same calculate_total() and generate_receipt() calls
+as the nightly job, so its financial details and receipt are exactly the ones
+the job prints. The per-item totals are kept in whole cents: each order's
+discount and tax are rounded to cents and split over its lines with whole cents
+too. Adding integers gives the same result in any order, so the totals are
+identical no matter how many workers are used.
+"""
+
+import importlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+# Index of each total in the per-item lists
+QUANTITY, REVENUE, DISCOUNT, TAX = range(4)
+
+def encode_order(order, item_ids):
+    """
+    Turn an order of {"name", "quantity"} dicts into a compact tuple.
+
+    Args:
+        order (list): List of dictionaries containing item names and quantities
+        item_ids (dict): Item name to ID
+
+    Returns:
+        tuple: (item ID, quantity) pairs
+    """
+    return tuple((item_ids[item["name"]], item["quantity"]) for item in order)
+
+def split_cents(amount, weights):
+    """
+    Split an amount in cents over lines in proportion to their weights.
+
+    Each line gets its share rounded down, then the cents left over go to the
+    lines that lost the most by rounding (earlier lines first on a tie).
+
+    Args:
+        amount (int): Amount to split, in cents
+        weights (list): Weight of each line, e.g. its price in cents
+
+    Returns:
+        list: Cents for each line, adding up to amount
+    """
+    total_weight = sum(weights)
+    if total_weight == 0:
+        return [0] * len(weights)
+    shares = []
+    remainders = []
+    for i, weight in enumerate(weights):
+        share, remainder = divmod(amount * weight, total_weight)
+        shares.append(share)
+        remainders.append((-remainder, i))
+    for _, i in sorted(remainders)[:amount - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+def _init_worker(menu):
+    """Give a worker process the same menu prices as the parent."""
+    for item, price in menu.items():
+        task.set_menu_price(item, price)
+
+def settle_shard(encoded_orders, item_names):
+    """
+    Settle a shard of orders.
+
+    Args:
+        encoded_orders (list): Orders from encode_order()
+        item_names (list): Item ID to name
+
+    Returns:
+        tuple: (results, item_totals) where results holds (financial_details, receipt)
+               for each order, as calculate_total() and generate_receipt() return
+               them, and item_totals maps item IDs to [quantity, revenue, discount, tax]
+               in cents
+    """
+    results = []
+    item_totals = {}
+    for encoded in encoded_orders:
+        order = [{"name": item_names[item_id], "quantity": quantity} for item_id, quantity in encoded]
+        financial_details = task.calculate_total(order)
+        results.append((financial_details, task.generate_receipt(order, financial_details)))
+
+        _, tax, discount, _ = financial_details
+        tax, discount = task.to_cents(tax), task.to_cents(discount)
+        line_amounts = [task.MENU_CENTS[item["name"]] * item["quantity"] for item in order]
+        line_discounts = split_cents(discount, line_amounts)
+        line_taxes = split_cents(tax, [a - d for a, d in zip(line_amounts, line_discounts)])
+        for (item_id, quantity), amount, line_discount, line_tax in zip(encoded, line_amounts, line_discounts, line_taxes):
+            totals = item_totals.get(item_id)
+            if totals is None:
+                totals = item_totals[item_id] = [0, 0, 0, 0]
+            totals[QUANTITY] += quantity
+            totals[REVENUE] += amount
+            totals[DISCOUNT] += line_discount
+            totals[TAX] += line_tax
+    return results, item_totals
+
+class SettlementPipeline:
+    """Settle a stream of orders on several processes, keeping their order"""
+
+    def __init__(self, workers=None, shard_size=1000):
+        """
+        Create a pipeline.
+
+        Args:
+            workers (int): Number of worker processes, 0 settles in this process
+                           and None uses one per CPU core
+            shard_size (int): Orders sent to a worker at a time
+        """
+        self.workers = workers
+        self.shard_size = shard_size
+        self.item_totals = {}  # item name: [quantity, revenue, discount, tax] in cents
+        self.order_count = 0
+        self.item_names = list(task.MENU)  # Item ID to name
+
+    def _merge(self, shard_totals):
+        """Add the per-item totals of one shard."""
+        for item_id, shard_item in shard_totals.items():
+            totals = self.item_totals.setdefault(self.item_names[item_id], [0, 0, 0, 0])
+            for i, value in enumerate(shard_item):
+                totals[i] += value
+
+    def _shards(self, orders):
+        """Yield lists of encoded orders, shard_size at a time."""
+        item_ids = {name: i for i, name in enumerate(self.item_names)}
+        orders = iter(orders)
+        while True:
+            shard = [encode_order(order, item_ids) for order in islice(orders, self.shard_size)]
+            if not shard:
+                return
+            yield shard
+
+    def run(self, orders):
+        """
+        Settle orders and yield their results in the same order.
+
+        The per-item totals of these orders are in item_totals, and their number
+        in order_count, once every result has been read; each run starts them
+        again from zero.
+
+        Args:
+            orders: Iterable of orders, each a list of {"name", "quantity"} dicts
+
+        Yields:
+            tuple: (financial_details, receipt) for each order, as calculate_total()
+                   and generate_receipt() return them
+        """
+        self.item_names = list(task.MENU)
+        self.item_totals = {}
+        self.order_count = 0
+        if self.workers == 0:
+            for shard in self._shards(orders):
+                yield from self._collect(*settle_shard(shard, self.item_names))
+            return
+
+        workers = self.workers or os.cpu_count()
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dict(task.MENU),)) as executor:
+            # Keep a few shards in flight per worker and read them back in order
+            pending = deque()
+            for shard in self._shards(orders):
+                pending.append(executor.submit(settle_shard, shard, self.item_names))
+                if len(pending) >= 2 * workers:
+                    yield from self._collect(*pending.popleft().result())
+            while pending:
+                yield from self._collect(*pending.popleft().result())
+
+    def _collect(self, results, shard_totals):
+        """Merge the totals of one settled shard and return its results."""
+        self._merge(shard_totals)
+        self.order_count += len(results)
+        return results
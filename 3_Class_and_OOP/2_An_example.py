@@ -1,5 +1,11 @@
+from types import MappingProxyType
+
+from food_search import SearchIndex
+
+
 class Food:
     """Class representing a food item with possible modifications"""
+    
     def __init__(self, name, base_price):
         self.name = name
         self.base_price = base_price
@@ -35,6 +41,13 @@ class Food:
             total += self.possible_modifications.get(mod, 0)
         return total
     
+    def calculate_price_cents(self):
+        """Calculate the total price in whole cents, so order totals add up exactly"""
+        total = round(self.base_price * 100)
+        for mod in self.selected_modifications:
+            total += round(self.possible_modifications.get(mod, 0) * 100)
+        return total
+    
     def get_description(self):
         """Get a description of the food with selected modifications"""
         if not self.selected_modifications:
@@ -51,16 +64,262 @@ class Food:
             print(f"  • {mod}: {price_text}")
 
 
+class OrderLine(Food):
+    """Class representing one ordered food item that shares its catalog Food data
+    
+    Only the selected modifications belong to the order line. Name, base price and
+    possible modifications are read from the catalog Food until this line sets
+    its own: setting name or base_price, or adding a possible modification,
+    changes this line only, like changing a copy of the Food would. The catalog
+    modifications are shown through a read-only view, so they cannot be
+    changed by accident through an order line.
+    
+    A line can stand for several identical units: quantity multiplies what it
+    adds to the order total, see Order.add_units().
+    """
+    __slots__ = ("food", "selected_modifications", "_quantity", "_name", "_base_price", "_own_modifications",
+                 "order", "order_cents")
+    
+    def __init__(self, food):
+        self.food = food
+        self.selected_modifications = []
+        self._quantity = 1
+        self._name = None  # Name of this line only, once set
+        self._base_price = None  # Base price of this line only, once set
+        self._own_modifications = None  # Copy of possible_modifications once changed
+        self.order = None  # Order whose running total includes this line
+        self.order_cents = 0  # Cents this line adds to the order total
+    
+    @property
+    def name(self):
+        return self.food.name if self._name is None else self._name
+    
+    @name.setter
+    def name(self, name):
+        self._name = name
+    
+    @property
+    def base_price(self):
+        return self.food.base_price if self._base_price is None else self._base_price
+    
+    @base_price.setter
+    def base_price(self, price):
+        self._base_price = price
+        self._update_order()
+    
+    @property
+    def quantity(self):
+        return self._quantity
+    
+    @quantity.setter
+    def quantity(self, quantity):
+        self._quantity = quantity
+        self._update_order()
+    
+    @property
+    def possible_modifications(self):
+        if self._own_modifications is not None:
+            return self._own_modifications
+        return MappingProxyType(self.food.possible_modifications)
+    
+    def add_possible_modification(self, mod_name, price_adjustment=0.0):
+        """Add a possible modification for this order line only"""
+        self.add_multiple_modifications({mod_name: price_adjustment})
+    
+    def add_multiple_modifications(self, mods_dict):
+        """Add multiple possible modifications for this order line only"""
+        self._copy_modifications().update(mods_dict)
+        # A selected modification may have a new price
+        self._update_order()
+    
+    def select_modification(self, mod_name):
+        """Select a modification for this order line and update the order total"""
+        if super().select_modification(mod_name):
+            self._update_order()
+            return True
+        return False
+    
+    def remove_modification(self, mod_name):
+        """Remove a selected modification and update the order total"""
+        if super().remove_modification(mod_name):
+            self._update_order()
+            return True
+        return False
+    
+    def get_description(self):
+        """Get a description of the order line, at the price its order charges for it"""
+        if self.order is None:
+            description = super().get_description()
+        else:
+            price = self.order_cents // self._quantity / 100
+            if not self.selected_modifications:
+                description = f"{self.name} (${price:.2f})"
+            else:
+                mods_text = ", ".join(self.selected_modifications)
+                description = f"{self.name} with {mods_text} (${price:.2f})"
+        return description if self._quantity == 1 else f"{self._quantity} x {description}"
+    
+    def _update_order(self):
+        """Replace what this line adds to its order total with its current price"""
+        if self.order is not None:
+            price_cents = self.calculate_price_cents() * self._quantity
+            self.order.subtotal_cents += price_cents - self.order_cents
+            self.order_cents = price_cents
+    
+    def _copy_modifications(self):
+        """Copy the catalog modifications before this line changes them"""
+        if self._own_modifications is None:
+            self._own_modifications = dict(self.food.possible_modifications)
+        return self._own_modifications
+
+
+class Order(list):
+    """Class representing the order lines of a customer with a running subtotal
+    
+    Every list method that adds or removes lines keeps subtotal_cents up to
+    date, and each OrderLine updates it when its modifications change, so the
+    total never needs a full pass over the order. Each line remembers the cents
+    it added (order_cents), so the total uses the prices from when each line
+    was added or last changed, and removing a line takes off exactly what it
+    added even if the catalog price has changed since. The lines describe
+    themselves at the same prices, so the order summary always adds up;
+    reprice() moves every line to the current catalog prices.
+    
+    add_units() and remove_units() keep one line per food and modification
+    set, with a quantity, instead of a line for every unit.
+    """
+    def __init__(self):
+        super().__init__()
+        self.subtotal_cents = 0
+        self._lines_by_food = {}  # id of catalog Food: order lines of that food
+    
+    def _attach(self, order_line):
+        """Add the price of a line that was just put in the order"""
+        order_line.order = self
+        order_line.order_cents = order_line.calculate_price_cents() * order_line.quantity
+        self.subtotal_cents += order_line.order_cents
+        self._lines_by_food.setdefault(id(order_line.food), []).append(order_line)
+    
+    def _detach(self, order_line):
+        """Take off the price of a line that was just taken out of the order"""
+        order_line.order = None
+        self.subtotal_cents -= order_line.order_cents
+        lines = self._lines_by_food[id(order_line.food)]
+        lines.remove(order_line)
+        if not lines:
+            del self._lines_by_food[id(order_line.food)]
+    
+    def add_units(self, food, quantity=1, modifications=(), line_class=OrderLine):
+        """Add units of a catalog food with these modifications, to the line holding the same ones if there is one
+        
+        Returns the order line the units were added to.
+        """
+        wanted = sorted(modifications)
+        for order_line in self._lines_by_food.get(id(food), ()):
+            # Lines with their own name, price or modifications are not the catalog item any more
+            if (sorted(order_line.selected_modifications) == wanted and order_line._name is None
+                    and order_line._base_price is None and order_line._own_modifications is None):
+                order_line.quantity += quantity
+                return order_line
+        order_line = line_class(food)
+        for mod_name in modifications:
+            order_line.select_modification(mod_name)
+        order_line.quantity = quantity
+        self.append(order_line)
+        return order_line
+    
+    def remove_units(self, order_line, quantity=1):
+        """Remove units from an order line, and the line once none are left
+        
+        Raises ValueError if the line has fewer units.
+        """
+        if order_line.quantity < quantity:
+            raise ValueError(f"Order line has fewer than {quantity} of {order_line.name!r}")
+        if order_line.quantity == quantity:
+            self.remove(order_line)
+        else:
+            order_line.quantity -= quantity
+    
+    def append(self, order_line):
+        """Add an order line and its price to the subtotal"""
+        super().append(order_line)
+        self._attach(order_line)
+    
+    def insert(self, index, order_line):
+        """Insert an order line and add its price to the subtotal"""
+        super().insert(index, order_line)
+        self._attach(order_line)
+    
+    def extend(self, order_lines):
+        """Add order lines and their prices to the subtotal"""
+        order_lines = list(order_lines)
+        super().extend(order_lines)
+        for order_line in order_lines:
+            self._attach(order_line)
+    
+    def __iadd__(self, order_lines):
+        self.extend(order_lines)
+        return self
+    
+    def __imul__(self, count):
+        raise TypeError("an order line can only be in an order once, add new lines instead")
+    
+    def pop(self, index=-1):
+        """Remove an order line and its price from the subtotal"""
+        order_line = super().pop(index)
+        self._detach(order_line)
+        return order_line
+    
+    def remove(self, order_line):
+        """Remove an order line and its price from the subtotal"""
+        super().remove(order_line)
+        self._detach(order_line)
+    
+    def __delitem__(self, index):
+        removed = self[index]
+        super().__delitem__(index)
+        for order_line in removed if isinstance(index, slice) else [removed]:
+            self._detach(order_line)
+    
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            removed, added = self[index], list(value)
+            super().__setitem__(index, added)
+        else:
+            removed, added = [self[index]], [value]
+            super().__setitem__(index, value)
+        for order_line in removed:
+            self._detach(order_line)
+        for order_line in added:
+            self._attach(order_line)
+    
+    def clear(self):
+        """Remove every order line"""
+        for order_line in self:
+            order_line.order = None
+        super().clear()
+        self.subtotal_cents = 0
+        self._lines_by_food.clear()
+    
+    def reprice(self):
+        """Update every line, and the subtotal, to the current catalog prices"""
+        for order_line in self:
+            order_line._update_order()
+
+
 class Category:
     """Class representing a food category containing multiple food items"""
     def __init__(self, name):
         self.name = name
         self.foods = {}  # name: Food object
+        self._menus = []  # Menus whose food index includes this category
     
     def add_food(self, food):
         """Add a Food object to this category"""
         if isinstance(food, Food):
             self.foods[food.name] = food
+            for menu in self._menus:
+                menu._index_food(self.name, food)
             return True
         return False
     
@@ -68,6 +327,8 @@ class Category:
         """Remove a food item from this category"""
         if food_name in self.foods:
             del self.foods[food_name]
+            for menu in self._menus:
+                menu._unindex_food(self.name, food_name)
             return True
         return False
     
@@ -88,25 +349,64 @@ class Category:
 
 class Menu:
     """Class representing the complete menu containing multiple categories"""
+    order_line_class = OrderLine  # Type of the lines add_to_order creates
+    
     def __init__(self, restaurant_name):
         self.restaurant_name = restaurant_name
         self.categories = {}  # name: Category object
-        self.current_order = []  # List of (Food, selected_mods) tuples
+        self.current_order = Order()  # OrderLine objects with a running subtotal
+        self._food_index = {}  # food name: tuple of (category name, Food object) pairs
+        self.version = 0  # Goes up whenever a food is added or removed
+        self._search_indexes = None  # (version, food SearchIndex, modifier SearchIndex)
     
     def add_category(self, category):
         """Add a Category object to the menu"""
         if isinstance(category, Category):
+            old_category = self.categories.get(category.name)
+            if old_category is not None:
+                self._unindex_category(old_category)
             self.categories[category.name] = category
+            category._menus.append(self)
+            for food in category.foods.values():
+                self._index_food(category.name, food)
             return True
         return False
     
     def remove_category(self, category_name):
         """Remove a category from the menu"""
         if category_name in self.categories:
+            self._unindex_category(self.categories[category_name])
             del self.categories[category_name]
             return True
         return False
     
+    def _index_food(self, category_name, food):
+        """Record a food item in the name index"""
+        entries = [entry for entry in self._food_index.get(food.name, ()) if entry[0] != category_name]
+        entries.append((category_name, food))
+        if len(entries) > 1:
+            # Keep entries in category order so get_food returns the same item as a full scan
+            order = list(self.categories)
+            entries.sort(key=lambda entry: order.index(entry[0]))
+        self._food_index[food.name] = tuple(entries)
+        self.version += 1
+    
+    def _unindex_food(self, category_name, food_name):
+        """Drop a food item from the name index"""
+        entries = tuple(entry for entry in self._food_index.get(food_name, ()) if entry[0] != category_name)
+        if entries:
+            self._food_index[food_name] = entries
+        else:
+            self._food_index.pop(food_name, None)
+        self.version += 1
+    
+    def _unindex_category(self, category):
+        """Drop every food of a category from the name index"""
+        if self in category._menus:
+            category._menus.remove(self)
+        for food_name in category.foods:
+            self._unindex_food(category.name, food_name)
+    
     def display_categories(self):
         """Display all categories in the menu"""
         print(f"\n=== {self.restaurant_name} Menu Categories ===")
@@ -122,12 +422,7 @@ class Menu:
     
     def search_food(self, food_name):
         """Search for a food item across all categories"""
-        found_items = []
-        
-        for category_name, category in self.categories.items():
-            food = category.get_food(food_name)
-            if food:
-                found_items.append((category_name, food))
+        found_items = list(self._food_index.get(food_name, ()))
         
         if found_items:
             print(f"\nFound '{food_name}' in:")
@@ -136,14 +431,34 @@ class Menu:
             return found_items
         else:
             print(f"'{food_name}' not found in any category")
+            suggestions = self.suggest_food(food_name)
+            if suggestions:
+                print(f"Did you mean: {', '.join(suggestions)}?")
             return []
     
+    def _get_search_indexes(self):
+        """Return the search indexes, building them again if the menu has changed"""
+        if self._search_indexes is None or self._search_indexes[0] != self.version:
+            modifiers = {}
+            for entries in self._food_index.values():
+                for _, food in entries:
+                    modifiers.update(dict.fromkeys(food.possible_modifications))
+            self._search_indexes = (self.version, SearchIndex(self._food_index), SearchIndex(modifiers))
+        return self._search_indexes
+    
+    def suggest_food(self, query, limit=5):
+        """Return food names that match the query by prefix or by spelling"""
+        return self._get_search_indexes()[1].search(query, limit)
+    
+    def suggest_modification(self, query, limit=5):
+        """Return modification names that match the query by prefix or by spelling"""
+        return self._get_search_indexes()[2].search(query, limit)
+    
     def get_food(self, food_name):
         """Get a food item by name from any category"""
-        for category in self.categories.values():
-            food = category.get_food(food_name)
-            if food:
-                return food
+        entries = self._food_index.get(food_name)
+        if entries:
+            return entries[0][1]
         return None
     
     def display_full_menu(self):
@@ -154,17 +469,28 @@ class Menu:
             for food_name, food in category.foods.items():
                 print(f"  {food_name}: ${food.base_price:.2f}")
     
-    def add_to_order(self, food_name):
-        """Add a food item to the current order"""
+    def add_to_order(self, food_name, quantity=1, modifications=None):
+        """Add a food item to the current order
+        
+        With a list of modifications (which can be empty), the units are added to
+        the order line with the same food and modifications if there is one, so a
+        large order keeps one line per distinct item.
+        """
         food = self.get_food(food_name)
         if food:
-            # Create a copy of the food item for this order
-            # This allows the same food to be ordered multiple times with different modifications
-            import copy
-            food_copy = copy.deepcopy(food)
-            self.current_order.append(food_copy)
-            print(f"Added '{food_name}' to your order")
-            return food_copy
+            if modifications is not None:
+                order_line = self.current_order.add_units(food, quantity, modifications, self.order_line_class)
+            else:
+                # Create an order line that shares the catalog food item
+                # This allows the same food to be ordered multiple times with different modifications
+                order_line = self.order_line_class(food)
+                order_line.quantity = quantity
+                self.current_order.append(order_line)
+            if quantity == 1:
+                print(f"Added '{food_name}' to your order")
+            else:
+                print(f"Added {quantity} x '{food_name}' to your order")
+            return order_line
         else:
             print(f"'{food_name}' not found in menu")
             return None
@@ -179,22 +505,39 @@ class Menu:
             print(f"Invalid order index: {index}")
             return False
     
-    def calculate_order_total(self):
-        """Calculate the total price of the current order"""
-        total = 0
+    def remove_units_from_order(self, index, quantity=1):
+        """Remove units of the order line at index, and the line once none are left"""
+        if 0 <= index < len(self.current_order) and 0 < quantity <= self.current_order[index].quantity:
+            order_line = self.current_order[index]
+            self.current_order.remove_units(order_line, quantity)
+            print(f"Removed {quantity} x '{order_line.name}' from your order")
+            return True
+        else:
+            print(f"Invalid order index or quantity: {index}, {quantity}")
+            return False
+    
+    def get_order_total(self, in_cents=False):
+        """Return the total price of the current order without printing anything"""
+        total_cents = self.current_order.subtotal_cents
+        return total_cents if in_cents else total_cents / 100
+    
+    def calculate_order_total(self, in_cents=False):
+        """Calculate the total price of the current order (as int cents if in_cents is True)"""
+        total = self.get_order_total(in_cents)
         
         print("\n=== Order Summary ===")
         for i, food in enumerate(self.current_order):
-            price = food.calculate_price()
-            total += price
             print(f"{i+1}. {food.get_description()}")
         
-        print(f"\nTotal: ${total:.2f}")
+        if in_cents:
+            print(f"\nTotal: ${total // 100}.{total % 100:02d}")
+        else:
+            print(f"\nTotal: ${total:.2f}")
         return total
     
     def clear_order(self):
         """Clear the current order"""
-        self.current_order = []
+        self.current_order.clear()
         print("Order cleared")
     
 
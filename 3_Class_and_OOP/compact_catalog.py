@@ -0,0 +1,199 @@
+"""
+Compact catalog for very large menus
+
+Every Food in 2_An_example.py carries its own modifications dict, even though
+most items share the same few modifier sets. CompactCatalog stores all items of
+a menu in columns instead:
+    names       - list of interned item names
+    prices      - array of base prices
+    table_ids   - array with the modifier table of each item
+    tables      - one shared dict per distinct modifier set, with interned names
+CompactFood is a small slotted Food that reads its data from these columns, and
+CompactCategory stores its foods in a catalog, so Menu works with it unchanged.
+
+A few things work differently from a Category of Food objects:
+    - catalog items are read-only menu entries: select_modification() and
+      remove_modification() raise TypeError, selections go on the order line
+      from Menu.add_to_order()
+    - possible_modifications is a read-only view of a table shared with other
+      items; add_possible_modification() gives the item a table of its own
+    - CompactCategory.add_food() copies a Food into the catalog; change the
+      item afterwards through category.get_food(), not the Food passed in
+    - removing a food leaves its row in the catalog until compact_menu() (or
+      CompactCatalog.compact()) drops the rows no category uses any more
+"""
+
+import importlib
+import sys
+from array import array
+from types import MappingProxyType
+
+example = importlib.import_module("2_An_example")
+Food = example.Food
+Category = example.Category
+
+
+class CompactCatalog:
+    """Class storing the data of many food items in shared columns"""
+    def __init__(self):
+        self.names = []
+        self.prices = array("d")
+        self.table_ids = array("I")
+        self.tables = []  # Shared modifier dicts
+        self._table_ids_by_key = {}  # tuple of (name, price) pairs: table id
+        self._removed = []  # CompactFoods removed from a category since the last compact()
+
+    def _table_id(self, modifications):
+        """Return the id of the shared table with these modifications, adding it if new"""
+        key = tuple(modifications.items())
+        table_id = self._table_ids_by_key.get(key)
+        if table_id is None:
+            table_id = len(self.tables)
+            self.tables.append({sys.intern(mod): price for mod, price in modifications.items()})
+            self._table_ids_by_key[key] = table_id
+        return table_id
+
+    def add(self, name, base_price, modifications=None):
+        """Store a food item and return a CompactFood for it"""
+        index = len(self.names)
+        self.names.append(sys.intern(name))
+        self.prices.append(base_price)
+        self.table_ids.append(self._table_id(modifications or {}))
+        return CompactFood(self, index)
+
+    def update_modifications(self, index, mods_dict):
+        """Give one item its own modifier set without changing the shared table"""
+        modifications = dict(self.tables[self.table_ids[index]])
+        modifications.update(mods_dict)
+        self.table_ids[index] = self._table_id(modifications)
+
+    def remove(self, food):
+        """Note that a food was removed from its category, so compact() can drop its row"""
+        self._removed.append(food)
+
+    def compact(self, foods):
+        """Drop every row not used by foods and number the remaining rows again
+
+        foods must hold every CompactFood of this catalog that is still on a
+        menu, from every category sharing the catalog; their index is updated.
+        Removed foods that something else still holds, like an order line,
+        get a one-row catalog of their own so they keep their data.
+        Returns the number of rows dropped.
+        """
+        foods = list({id(food): food for food in foods}.values())
+        keep = sorted({food.index for food in foods})
+        kept = set(keep)
+        for food in self._removed:
+            if food.catalog is self and food.index not in kept:
+                detached = CompactCatalog()
+                detached.add(food.name, food.base_price, food.possible_modifications)
+                food.catalog, food.index = detached, 0
+        self._removed = []
+
+        dropped = len(self.names) - len(keep)
+        new_index = {old: new for new, old in enumerate(keep)}
+        self.names = [self.names[i] for i in keep]
+        self.prices = array("d", [self.prices[i] for i in keep])
+        self.table_ids = array("I", [self.table_ids[i] for i in keep])
+        for food in foods:
+            food.index = new_index[food.index]
+        return dropped
+
+    def __len__(self):
+        return len(self.names)
+
+
+class CompactFood(Food):
+    """Class representing a catalog food item stored in a CompactCatalog
+
+    Catalog items are read-only menu entries: selections belong to the order
+    lines that Menu.add_to_order creates for them.
+    """
+    __slots__ = ("catalog", "index")
+    selected_modifications = ()
+
+    def __init__(self, catalog, index):
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def name(self):
+        return self.catalog.names[self.index]
+
+    @property
+    def base_price(self):
+        return self.catalog.prices[self.index]
+
+    @base_price.setter
+    def base_price(self, price):
+        self.catalog.prices[self.index] = price
+
+    @property
+    def possible_modifications(self):
+        # The table is shared by every item with the same modifications: change it through
+        # add_possible_modification(), which gives this item a table of its own
+        return MappingProxyType(self.catalog.tables[self.catalog.table_ids[self.index]])
+
+    def add_possible_modification(self, mod_name, price_adjustment=0.0):
+        """Add a possible modification for this food item"""
+        self.catalog.update_modifications(self.index, {mod_name: price_adjustment})
+
+    def add_multiple_modifications(self, mods_dict):
+        """Add multiple possible modifications at once"""
+        self.catalog.update_modifications(self.index, mods_dict)
+
+    def select_modification(self, mod_name):
+        """Catalog items cannot hold selections; select on the order line from Menu.add_to_order()"""
+        raise TypeError(f"{self.name!r} is a read-only catalog item: "
+                        "select modifications on the order line returned by Menu.add_to_order()")
+
+    def remove_modification(self, mod_name):
+        """Catalog items cannot hold selections; remove them on the order line from Menu.add_to_order()"""
+        raise TypeError(f"{self.name!r} is a read-only catalog item: "
+                        "remove modifications on the order line returned by Menu.add_to_order()")
+
+
+class CompactCategory(Category):
+    """Class representing a food category whose foods live in a CompactCatalog"""
+    def __init__(self, name, catalog=None):
+        super().__init__(name)
+        self.catalog = catalog if catalog is not None else CompactCatalog()
+
+    def add_food(self, food):
+        """Add a Food object to this category, storing a copy of its data in the catalog"""
+        if isinstance(food, CompactFood) and food.catalog is self.catalog:
+            return super().add_food(food)
+        if isinstance(food, Food):
+            return super().add_food(self.catalog.add(food.name, food.base_price, food.possible_modifications))
+        return False
+
+    def add_compact_food(self, name, base_price, modifications=None):
+        """Add a food item straight into the catalog without building a Food first"""
+        food = self.catalog.add(name, base_price, modifications)
+        super().add_food(food)
+        return food
+
+    def remove_food(self, food_name):
+        """Remove a food item from this category; compact_menu() frees its catalog row"""
+        food = self.foods.get(food_name)
+        if not super().remove_food(food_name):
+            return False
+        if isinstance(food, CompactFood) and food.catalog is self.catalog:
+            self.catalog.remove(food)
+        return True
+
+
+def compact_menu(menu):
+    """Compact the catalog of every CompactCategory in a menu
+
+    Every category sharing a catalog must be on this menu, or its foods lose
+    their rows. Returns the number of rows dropped.
+    """
+    foods_by_catalog = {}  # id of catalog: (catalog, CompactFoods still on the menu)
+    for category in menu.categories.values():
+        if isinstance(category, CompactCategory):
+            catalog = category.catalog
+            foods = foods_by_catalog.setdefault(id(catalog), (catalog, []))[1]
+            foods.extend(food for food in category.foods.values()
+                         if isinstance(food, CompactFood) and food.catalog is catalog)
+    return sum(catalog.compact(foods) for catalog, foods in foods_by_catalog.values())
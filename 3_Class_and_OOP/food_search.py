@@ -0,0 +1,172 @@
+"""
+Prefix and fuzzy search over food and modifier names
+
+SearchIndex is built once from a list of names and then answers queries such as
+"big m" or "quater pounder" with a ranked list of suggestions:
+    1. names equal to the query (ignoring case)
+    2. names where the query is the start of the name or of one of its words,
+       found by binary search in a sorted list of word starts (this answers
+       the same questions as a prefix trie without a dict for every letter),
+       shortest names first; a segment tree over the list finds the shortest
+       ones without reading every match
+    3. names that share the most trigrams (groups of 3 letters) with the query,
+       so typos still find the right name; candidates come from the lists of
+       the rarest query trigrams (the ones with the highest IDF), and the
+       lists of very common trigrams are skipped rather than read in part, so
+       the names added first are not favoured
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+
+def _normalize(text):
+    """Return text in lower case with single spaces"""
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text):
+    """Return the set of 3-letter groups in text, padded so short words count too"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Class representing a search index over a fixed list of names"""
+    # Most entry ids read from trigram lists for one query, rarest trigrams first
+    MAX_POSTINGS_READ = 5_000
+
+    def __init__(self, names):
+        self.names = []  # Original names, by entry id
+        self._normalized = []  # Normalized names, by entry id
+        self._ids_by_name = {}  # normalized name: entry id
+        self._prefix_keys = []  # Sorted (name from a word start, entry id) pairs
+        self._postings = {}  # trigram: array of entry ids
+        self._trigram_counts = array("H")  # Number of distinct trigrams, by entry id
+        for name in names:
+            self._add(name)
+        self._prefix_keys.sort()
+        self._build_length_tree()
+
+    def _add(self, name):
+        """Add one name to the prefix list and the trigram index"""
+        normalized = _normalize(name)
+        if normalized in self._ids_by_name:
+            return
+        entry_id = len(self.names)
+        self.names.append(name)
+        self._normalized.append(normalized)
+        self._ids_by_name[normalized] = entry_id
+
+        # Index the name from the start of every word, so "mac" finds "Big Mac"
+        start = 0
+        while start != -1:
+            self._prefix_keys.append((normalized[start:], entry_id))
+            start = normalized.find(" ", start)
+            if start != -1:
+                start += 1
+
+        trigrams = _trigrams(normalized)
+        self._trigram_counts.append(len(trigrams))
+        for trigram in trigrams:
+            posting = self._postings.get(trigram)
+            if posting is None:
+                posting = self._postings[trigram] = array("I")
+            posting.append(entry_id)
+
+    def _build_length_tree(self):
+        """Build a tree holding the shortest name under every range of prefix keys"""
+        normalized = self._normalized
+        # Rank every entry by (length, name), the order prefix matches are returned in
+        self._ids_by_rank = sorted(range(len(normalized)),
+                                   key=lambda entry_id: (len(normalized[entry_id]), normalized[entry_id]))
+        ranks = array("I", [0]) * len(normalized)
+        for rank, entry_id in enumerate(self._ids_by_rank):
+            ranks[entry_id] = rank
+        # Bottom-up segment tree: leaves are the keys in sorted order, each node the lowest rank below it
+        size = len(self._prefix_keys)
+        tree = array("I", [0]) * size
+        tree.extend(ranks[entry_id] for _, entry_id in self._prefix_keys)
+        for node in range(size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+        self._length_tree = tree
+
+    def _prefix_ids(self, prefix, limit):
+        """Return up to limit entry ids with a word starting with prefix, shortest names first"""
+        keys = self._prefix_keys
+        start = bisect_left(keys, (prefix,))
+        # Every key starting with prefix sorts before prefix with its last letter raised by one
+        end = bisect_left(keys, (prefix[:-1] + chr(ord(prefix[-1]) + 1),), start)
+        # Take the nodes covering keys start to end, then open the one with the shortest name until
+        # limit different names are found, so only about limit * log(keys) nodes are looked at
+        tree, size = self._length_tree, len(keys)
+        heap = []
+        low, high = start + size, end + size
+        while low < high:
+            if low & 1:
+                heap.append((tree[low], low))
+                low += 1
+            if high & 1:
+                high -= 1
+                heap.append((tree[high], high))
+            low >>= 1
+            high >>= 1
+        heapq.heapify(heap)
+        found = []
+        while heap and len(found) < limit:
+            rank, node = heapq.heappop(heap)
+            if node >= size:
+                entry_id = self._ids_by_rank[rank]
+                # A name is a key once for every word, so it can come up again
+                if entry_id not in found:
+                    found.append(entry_id)
+            else:
+                heapq.heappush(heap, (tree[2 * node], 2 * node))
+                heapq.heappush(heap, (tree[2 * node + 1], 2 * node + 1))
+        return found
+
+    def _fuzzy_ids(self, query, limit):
+        """Return up to limit entry ids ranked by trigram similarity"""
+        query_trigrams = _trigrams(query)
+        postings = sorted((self._postings[trigram] for trigram in query_trigrams if trigram in self._postings),
+                          key=len)
+        hits = Counter()
+        read = 0
+        for posting in postings:
+            # Rare trigrams say the most about a name (high IDF): their lists are read whole, and the
+            # lists of common trigrams are skipped once they would go over the budget. The rarest
+            # list is always read.
+            if read and read + len(posting) > self.MAX_POSTINGS_READ:
+                break
+            hits.update(posting)
+            read += len(posting)
+
+        # Rank the best candidates by how much of both names all their shared trigrams cover
+        scored = []
+        for entry_id, _ in hits.most_common(limit * 10):
+            shared = len(query_trigrams & _trigrams(self._normalized[entry_id]))
+            similarity = shared / (len(query_trigrams) + self._trigram_counts[entry_id] - shared)
+            if similarity > 0.2:
+                scored.append((similarity, entry_id))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [entry_id for _, entry_id in scored[:limit]]
+
+    def search(self, query, limit=5):
+        """Return up to limit names that best match the query"""
+        query = _normalize(query)
+        if not query:
+            return []
+        result = []
+        exact_id = self._ids_by_name.get(query)
+        if exact_id is not None:
+            result.append(exact_id)
+        for entry_id in self._prefix_ids(query, limit):
+            if entry_id not in result:
+                result.append(entry_id)
+        if len(result) < limit:
+            for entry_id in self._fuzzy_ids(query, limit):
+                if entry_id not in result:
+                    result.append(entry_id)
+        return [self.names[entry_id] for entry_id in result[:limit]]
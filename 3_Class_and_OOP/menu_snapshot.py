@@ -0,0 +1,259 @@
+"""
+Binary menu snapshots
+
+save_menu() writes a whole Menu to one file, and load_menu() gives it back
+without running any of the Python that built it. The file is little-endian:
+
+    header      - magic b"MENUSNAP", format version, menu version and the
+                  size of every section
+    strings     - every distinct name once, UTF-8, separated by NUL bytes,
+                  starting with the restaurant name; everything else refers
+                  to names by their position here
+    categories  - fixed-width columns: name id (u32), number of foods (u32)
+    foods       - fixed-width columns: name id (u32), modifier table id (u32),
+                  base price (f64); foods are stored category by category
+    tables      - fixed-width columns: first entry (u32), number of entries (u32)
+    entries     - fixed-width columns: modifier name id (u32), price (f64)
+
+Every column starts on an 8-byte boundary. Foods that share a modifier set
+share one table, like in CompactCatalog.
+
+load_menu() only reads the header. The categories, foods and name index are
+built the first time the menu is used, straight into a CompactCatalog, whose
+columns are copied from the file in one go.
+"""
+
+import gc
+import importlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import repeat
+
+example = importlib.import_module("2_An_example")
+compact_catalog = importlib.import_module("compact_catalog")
+Menu = example.Menu
+
+MAGIC = b"MENUSNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHQIIIII")  # magic, format version, flags, menu version, section sizes
+STRINGS_OFFSET = HEADER.size + (-HEADER.size % 8)
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a menu snapshot this code can read"""
+
+
+def _padding(size):
+    """Return the bytes needed after size bytes to reach an 8-byte boundary"""
+    return b"\0" * (-size % 8)
+
+
+def _column(typecode, values):
+    """Return values as little-endian bytes padded to 8 bytes"""
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    data = column.tobytes()
+    return data + _padding(len(data))
+
+
+def _read_column(buffer, offset, typecode, count):
+    """Return (array, offset after the padded column) for a column written by _column"""
+    column = array(typecode)
+    end = offset + count * column.itemsize
+    if end > len(buffer):
+        raise SnapshotError("Menu snapshot is truncated")
+    column.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column, end + (-end % 8)
+
+
+def save_menu(menu, path, menu_version=None):
+    """Write a Menu to a snapshot file; menu_version defaults to menu.version
+
+    The file is written under a temporary name and renamed over path, so a
+    process reading path sees either the old snapshot or the new one.
+    """
+    string_ids = {}
+
+    def string_id(text):
+        if "\0" in text:
+            raise ValueError(f"Names in a menu snapshot cannot contain NUL: {text!r}")
+        return string_ids.setdefault(text, len(string_ids))
+
+    string_id(menu.restaurant_name)
+    category_names, category_sizes = [], []
+    food_names, food_tables, food_prices = [], [], []
+    table_ids = {}  # tuple of (name, price) pairs: table id
+    table_firsts, table_sizes = [], []
+    entry_names, entry_prices = [], []
+
+    for category in menu.categories.values():
+        category_names.append(string_id(category.name))
+        category_sizes.append(len(category.foods))
+        for food in category.foods.values():
+            key = tuple(food.possible_modifications.items())
+            table_id = table_ids.get(key)
+            if table_id is None:
+                table_id = table_ids[key] = len(table_firsts)
+                table_firsts.append(len(entry_names))
+                table_sizes.append(len(key))
+                for mod_name, price in key:
+                    entry_names.append(string_id(mod_name))
+                    entry_prices.append(price)
+            food_names.append(string_id(food.name))
+            food_tables.append(table_id)
+            food_prices.append(food.base_price)
+
+    strings = "\0".join(string_ids).encode("utf-8")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, menu.version if menu_version is None else menu_version,
+                         len(strings), len(category_names), len(food_names),
+                         len(table_firsts), len(entry_names))
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(header + _padding(len(header)))
+        f.write(strings + _padding(len(strings)))
+        for typecode, values in [("I", category_names), ("I", category_sizes),
+                                 ("I", food_names), ("I", food_tables), ("d", food_prices),
+                                 ("I", table_firsts), ("I", table_sizes),
+                                 ("I", entry_names), ("d", entry_prices)]:
+            f.write(_column(typecode, values))
+    os.replace(temporary_path, path)
+
+
+def read_header(buffer):
+    """Return the header fields of a snapshot as a dict"""
+    if len(buffer) < HEADER.size or bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise SnapshotError("Not a menu snapshot")
+    fields = dict(zip(["magic", "format_version", "flags", "menu_version", "string_bytes",
+                       "category_count", "food_count", "table_count", "entry_count"],
+                      HEADER.unpack_from(buffer)))
+    if fields["format_version"] != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported menu snapshot format version {fields['format_version']}")
+    return fields
+
+
+def _check_references(strings, category_names, category_sizes, food_names, food_tables,
+                      table_firsts, table_sizes, entry_names):
+    """Raise SnapshotError unless every id and size in the columns points inside the file"""
+    for label, ids, count in [("category name", category_names, len(strings)),
+                              ("food name", food_names, len(strings)),
+                              ("modifier name", entry_names, len(strings)),
+                              ("modifier table", food_tables, len(table_firsts))]:
+        if ids and max(ids) >= count:
+            raise SnapshotError(f"Menu snapshot has a {label} id {max(ids)} out of range (only {count})")
+    if sum(category_sizes) != len(food_names):
+        raise SnapshotError(f"Menu snapshot categories hold {sum(category_sizes)} foods, "
+                            f"but it has {len(food_names)}")
+    for first, size in zip(table_firsts, table_sizes):
+        if first + size > len(entry_names):
+            raise SnapshotError(f"Menu snapshot has a modifier table past its {len(entry_names)} entries")
+
+
+class SnapshotMenu(Menu):
+    """Class representing a Menu read from a snapshot file on first use"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            try:
+                self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                raise SnapshotError("Not a menu snapshot") from None
+        self._header = read_header(self._buffer)
+        # Only the restaurant name is decoded now; the rest waits for _load()
+        strings_end = STRINGS_OFFSET + self._header["string_bytes"]
+        name_end = self._buffer.find(b"\0", STRINGS_OFFSET, strings_end)
+        try:
+            restaurant_name = self._buffer[STRINGS_OFFSET:strings_end if name_end < 0 else name_end].decode("utf-8")
+        except UnicodeDecodeError as error:
+            raise SnapshotError(f"Menu snapshot has a damaged name: {error}") from None
+        super().__init__(restaurant_name)
+        self.snapshot_version = self._header["menu_version"]
+        del self.categories, self._food_index
+
+    def __getattr__(self, name):
+        # Only called while categories and _food_index have not been built yet
+        if name in ("categories", "_food_index") and "_buffer" in vars(self):
+            self._load()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _load(self):
+        """Build the categories, the catalog and the name index from the file"""
+        # Everything built here lives as long as the menu, so pausing the cycle
+        # collector only saves it from scanning the new objects over and over
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._build()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        self._buffer.close()
+        del self._buffer
+
+    def _build(self):
+        """Read every section of the file into categories and the name index"""
+        buffer, header = self._buffer, self._header
+        end = STRINGS_OFFSET + header["string_bytes"]
+        if end > len(buffer):
+            raise SnapshotError("Menu snapshot is truncated")
+        try:
+            strings = [sys.intern(text) for text in buffer[STRINGS_OFFSET:end].decode("utf-8").split("\0")]
+        except UnicodeDecodeError as error:
+            raise SnapshotError(f"Menu snapshot has a damaged name: {error}") from None
+        offset = end + (-end % 8)
+
+        category_names, offset = _read_column(buffer, offset, "I", header["category_count"])
+        category_sizes, offset = _read_column(buffer, offset, "I", header["category_count"])
+        food_names, offset = _read_column(buffer, offset, "I", header["food_count"])
+        food_tables, offset = _read_column(buffer, offset, "I", header["food_count"])
+        food_prices, offset = _read_column(buffer, offset, "d", header["food_count"])
+        table_firsts, offset = _read_column(buffer, offset, "I", header["table_count"])
+        table_sizes, offset = _read_column(buffer, offset, "I", header["table_count"])
+        entry_names, offset = _read_column(buffer, offset, "I", header["entry_count"])
+        entry_prices, offset = _read_column(buffer, offset, "d", header["entry_count"])
+        _check_references(strings, category_names, category_sizes, food_names, food_tables,
+                          table_firsts, table_sizes, entry_names)
+
+        catalog = compact_catalog.CompactCatalog()
+        catalog.names = [strings[i] for i in food_names]
+        catalog.prices = food_prices
+        catalog.table_ids = food_tables
+        for first, size in zip(table_firsts, table_sizes):
+            table = {strings[entry_names[i]]: entry_prices[i] for i in range(first, first + size)}
+            catalog._table_ids_by_key[tuple(table.items())] = len(catalog.tables)
+            catalog.tables.append(table)
+
+        categories = {}
+        entries = []  # (category name, food) for every food, in file order
+        names = catalog.names
+        CompactFood = compact_catalog.CompactFood
+        start = 0
+        for name_id, size in zip(category_names, category_sizes):
+            category = compact_catalog.CompactCategory(strings[name_id], catalog)
+            foods = [CompactFood(catalog, index) for index in range(start, start + size)]
+            category.foods.update(zip(names[start:start + size], foods))
+            entries.extend(zip(repeat(category.name), foods))
+            start += size
+            category._menus.append(self)
+            categories[category.name] = category
+
+        food_index = dict(zip(names, zip(entries)))
+        if len(food_index) != len(names):
+            # Some names are in several categories; keep them all, in category order
+            food_index = {}
+            for name, entry in zip(names, entries):
+                food_index[name] = food_index.get(name, ()) + (entry,)
+
+        self.categories = categories
+        self._food_index = food_index
+        self.version += 1
+
+
+def load_menu(path):
+    """Open a snapshot file as a Menu; the foods are read when the menu is first used"""
+    return SnapshotMenu(path)
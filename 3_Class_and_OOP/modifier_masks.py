@@ -0,0 +1,211 @@
+"""
+Modifier selections as bitmasks
+
+An OrderLine keeps its selected modifications in a list, so the same one can be
+chosen any number of times, removing one searches the list and the price looks
+up every selected modification again. MaskOrderLine stores them as one int:
+
+    - every possible modification of a food gets a bit, in the order of its
+      possible_modifications dict; a ModifierTable holds the bits of one food
+    - choosing a modification sets its bit, so it can only be chosen once,
+      except the ones named as stackable (like "Extra Patty") which also keep
+      a count, e.g. two "Extra Patty"
+    - the price of every mask is worked out once: for a few modifications all
+      masks are computed up front, for more they are remembered as used; the
+      prices are read from the food's modifications, and worked out again
+      when one of them changes
+
+Use it for a whole menu with use_modifier_masks(menu). Each menu gets its own
+ModifierTables cache, which goes away with the menu.
+"""
+
+import importlib
+import weakref
+from functools import partial
+
+example = importlib.import_module("2_An_example")
+OrderLine = example.OrderLine
+
+# Modifications of create_mcdonalds_menu() that can be chosen more than once on a line
+DEFAULT_STACKABLE = frozenset({"Extra Patty", "Extra Cheese", "Extra Bacon", "Extra Egg", "Extra Sauce", "Extra Shot"})
+MAX_STACK = 255  # Most times one stackable modification can be chosen on a line
+PRECOMPUTE_BITS = 8  # Tables with up to this many modifications price every mask up front
+
+
+class ModifierTable:
+    """Class giving the modifications of a food bits and pricing any mask of them"""
+
+    def __init__(self, modifications, stackable=DEFAULT_STACKABLE):
+        self.modifications = modifications  # The food's own mapping, read for every price
+        self.stackable = stackable
+        self.names = tuple(modifications)
+        self.bits = {name: bit for bit, name in enumerate(self.names)}
+        self.stackable_mask = 0
+        for bit, name in enumerate(self.names):
+            if name in stackable:
+                self.stackable_mask |= 1 << bit
+        self._prices = None  # Prices the cents below were worked out from
+
+    def _check_prices(self):
+        """Work out the prices in cents again if a modification price has changed"""
+        prices = tuple(self.modifications.values())
+        if prices == self._prices:
+            return
+        self._prices = prices
+        self.prices_cents = tuple(round(price * 100) for price in prices)
+        if len(self.names) <= PRECOMPUTE_BITS:
+            # Each mask costs its lowest bit plus the mask without that bit
+            mask_prices = [0] * (1 << len(self.names))
+            for mask in range(1, len(mask_prices)):
+                low_bit = mask & -mask
+                mask_prices[mask] = mask_prices[mask ^ low_bit] + self.prices_cents[low_bit.bit_length() - 1]
+            self._mask_prices = mask_prices
+        else:
+            self._mask_prices = {0: 0}
+
+    def matches(self, modifications):
+        """Return True if the table has the bits of these modifications"""
+        return self.names == tuple(modifications)
+
+    def price_cents(self, mask, stack_counts=None):
+        """Return the price in cents of the modifications in mask, with stacked ones counted again"""
+        self._check_prices()
+        prices = self._mask_prices
+        if isinstance(prices, list):
+            price = prices[mask]
+        else:
+            price = prices.get(mask)
+            if price is None:
+                price = prices[mask] = sum(self.prices_cents[bit] for bit in self.bits_of(mask))
+        if stack_counts:
+            for bit in self.bits_of(mask & self.stackable_mask):
+                if stack_counts[bit] > 1:
+                    price += (stack_counts[bit] - 1) * self.prices_cents[bit]
+        return price
+
+    def bits_of(self, mask):
+        """Return the bits set in mask, lowest first"""
+        bits = []
+        while mask:
+            low_bit = mask & -mask
+            bits.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return bits
+
+
+class ModifierTables:
+    """Class keeping the ModifierTable of every food of one menu"""
+
+    def __init__(self, stackable=DEFAULT_STACKABLE):
+        self.stackable = frozenset(stackable)
+        self._tables = weakref.WeakKeyDictionary()  # catalog Food: its ModifierTable
+
+    def for_food(self, food):
+        """Return the table of a catalog food, making it again if its modifications have changed"""
+        table = self._tables.get(food)
+        modifications = food.possible_modifications
+        if table is None or not table.matches(modifications):
+            table = self._tables[food] = ModifierTable(modifications, self.stackable)
+        return table
+
+    def __len__(self):
+        return len(self._tables)
+
+
+class MaskOrderLine(OrderLine):
+    """Class representing an order line whose selected modifications are a bitmask
+
+    stack_counts holds how many times each stackable modification is chosen,
+    so the price of a line is a table lookup plus the extra stacked choices.
+    """
+    __slots__ = ("table", "mask", "stack_counts")
+
+    def __init__(self, food, tables=None):
+        self.food = food
+        self._quantity = 1
+        self._name = None
+        self._base_price = None
+        self._own_modifications = None
+        self.order = None
+        self.order_cents = 0
+        self.table = (ModifierTables() if tables is None else tables).for_food(food)
+        self.mask = 0
+        self.stack_counts = None  # bytearray with a count per bit, once something is stacked
+
+    @property
+    def selected_modifications(self):
+        """Names of the selected modifications in bit order, repeated when stacked"""
+        names = []
+        for bit in self.table.bits_of(self.mask):
+            count = self.stack_counts[bit] if self.stack_counts else 1
+            names.extend([self.table.names[bit]] * max(count, 1))
+        return names
+
+    def select_modification(self, mod_name):
+        """Select a modification; stackable ones can be selected more than once"""
+        bit = self.table.bits.get(mod_name)
+        if bit is None:
+            return False
+        flag = 1 << bit
+        if self.table.stackable_mask & flag:
+            if self.stack_counts is None:
+                self.stack_counts = bytearray(len(self.table.names))
+            count = self.stack_counts[bit]
+            if count >= MAX_STACK:
+                return False
+            self.stack_counts[bit] = count + 1
+        elif self.mask & flag:
+            return False
+        self.mask |= flag
+        self._update_order()
+        return True
+
+    def remove_modification(self, mod_name):
+        """Remove one selection of a modification"""
+        bit = self.table.bits.get(mod_name)
+        if bit is None or not self.mask >> bit & 1:
+            return False
+        if self.stack_counts and self.stack_counts[bit]:
+            self.stack_counts[bit] -= 1
+            if not self.stack_counts[bit]:
+                self.mask &= ~(1 << bit)
+        else:
+            self.mask &= ~(1 << bit)
+        self._update_order()
+        return True
+
+    def calculate_price_cents(self):
+        """Calculate the total price in whole cents from the price table"""
+        return round(self.base_price * 100) + self.table.price_cents(self.mask, self.stack_counts)
+
+    def calculate_price(self):
+        """Calculate the total price, rounded to whole cents"""
+        return self.calculate_price_cents() / 100
+
+    def add_multiple_modifications(self, mods_dict):
+        """Add multiple possible modifications for this order line only, keeping the selection"""
+        selected = self.selected_modifications
+        self._copy_modifications().update(mods_dict)
+        self.table = ModifierTable(self._own_modifications, self.table.stackable)
+        self.mask = 0
+        self.stack_counts = None
+        order, self.order = self.order, None
+        for mod_name in selected:
+            self.select_modification(mod_name)
+        self.order = order
+        self._update_order()
+
+
+def use_modifier_masks(menu, stackable=DEFAULT_STACKABLE):
+    """Make menu.add_to_order create MaskOrderLines and give every food its bits now
+
+    stackable names the modifications that can be chosen more than once on a
+    line. Returns the number of modifier tables of this menu.
+    """
+    tables = ModifierTables(stackable)
+    for category in menu.categories.values():
+        for food in category.foods.values():
+            tables.for_food(food)
+    menu.modifier_tables = tables
+    menu.order_line_class = partial(MaskOrderLine, tables=tables)
+    return len(tables)
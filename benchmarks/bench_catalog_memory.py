@@ -0,0 +1,93 @@
+"""
+Benchmark: memory per menu item, Food/Category vs compact catalog
+
+Builds the same large menu twice, once with Food objects in plain Category
+objects and once with CompactCategory, and reports the traced bytes per item.
+The item names and modifier sets repeat the patterns of create_mcdonalds_menu().
+
+Usage:
+    python benchmarks/bench_catalog_memory.py [number_of_items]
+"""
+
+import importlib
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3_Class_and_OOP"))
+example = importlib.import_module("2_An_example")
+compact_catalog = importlib.import_module("compact_catalog")
+
+DEFAULT_ITEMS = 100_000
+CATEGORY_COUNT = 20
+
+MODIFIER_SETS = [
+    {"Extra Cheese": 0.50, "No Pickles": 0.00, "No Onions": 0.00},
+    {"Extra Sauce": 0.25, "BBQ Sauce": 0.00, "Sweet & Sour Sauce": 0.00, "Ranch Sauce": 0.00, "Honey Mustard": 0.00},
+    {"Extra Mayo": 0.25, "No Lettuce": 0.00, "Extra Sauce": 0.25, "Bacon": 1.00},
+    {"Extra Egg": 1.00, "No Cheese": -0.50, "Extra Bacon": 1.00, "Extra Butter": 0.00, "Extra Syrup": 0.25},
+    {"Extra Salt": 0.00, "No Salt": 0.00, "Add Cheese": 0.75},
+    {"No Ice": 0.00, "Extra Ice": 0.00, "Diet Coke": 0.00, "Sprite": 0.00},
+]
+
+
+def item_data(count):
+    """Yield (name, price, modifications) for count synthetic items"""
+    for i in range(count):
+        yield f"Item {i}", 1.0 + (i % 1000) / 100, MODIFIER_SETS[i % len(MODIFIER_SETS)]
+
+
+def build_plain_menu(items):
+    """Build a menu of Food objects in Category objects"""
+    menu = example.Menu("Plain")
+    categories = [example.Category(f"Category {i}") for i in range(CATEGORY_COUNT)]
+    for category in categories:
+        menu.add_category(category)
+    for i, (name, price, modifications) in enumerate(items):
+        food = example.Food(name, price)
+        food.add_multiple_modifications(modifications)
+        categories[i % CATEGORY_COUNT].add_food(food)
+    return menu
+
+
+def build_compact_menu(items):
+    """Build the same menu with CompactCategory objects sharing one catalog"""
+    menu = example.Menu("Compact")
+    catalog = compact_catalog.CompactCatalog()
+    categories = [compact_catalog.CompactCategory(f"Category {i}", catalog) for i in range(CATEGORY_COUNT)]
+    for category in categories:
+        menu.add_category(category)
+    for i, (name, price, modifications) in enumerate(items):
+        categories[i % CATEGORY_COUNT].add_compact_food(name, price, modifications)
+    return menu
+
+
+def measure(builder, count):
+    """Return (bytes per item, build seconds) for building a menu of count items"""
+    items = list(item_data(count))
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    menu = builder(items)
+    seconds = time.perf_counter() - start
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert menu.get_food(items[-1][0]).base_price == items[-1][1]
+    return (after - before) / count, seconds
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    plain_bytes, plain_time = measure(build_plain_menu, count)
+    compact_bytes, compact_time = measure(build_compact_menu, count)
+
+    print(f"Menu of {count} items in {CATEGORY_COUNT} categories")
+    print("Backend".ljust(20) + "Bytes/item".rjust(12) + "Build (s)".rjust(12))
+    print("-" * 44)
+    print(f"{'Food/Category':<20}{plain_bytes:>12.0f}{plain_time:>12.3f}")
+    print(f"{'CompactCategory':<20}{compact_bytes:>12.0f}{compact_time:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
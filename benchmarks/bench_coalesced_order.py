@@ -0,0 +1,76 @@
+"""
+Benchmark: large orders with and without coalesced lines
+
+Builds catering orders where every item is entered one unit at a time, then
+prices them and prints their receipts:
+    list       - a plain list with one line per entry, like take_order()
+    coalesced  - CoalescedOrder from 2_Function/Answer/coalesced_order.py,
+                 one line per item
+
+Usage:
+    python benchmarks/bench_coalesced_order.py [entries_per_order] [number_of_orders]
+"""
+
+import importlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "2_Function", "Answer"))
+task = importlib.import_module("4_Hands_on_real_world_task")
+from coalesced_order import CoalescedOrder
+
+DEFAULT_ENTRIES = 500
+DEFAULT_ORDERS = 200
+
+
+def generate_entries(entries, count, seed=0):
+    """Return count lists of entries, each one unit of a random item"""
+    rng = random.Random(seed)
+    names = list(task.MENU)
+    return [[{"name": rng.choice(names), "quantity": 1} for _ in range(entries)] for _ in range(count)]
+
+
+def run(container, orders):
+    """Return (build seconds, price and receipt seconds, receipt lengths) for orders kept in container"""
+    start = time.perf_counter()
+    built = []
+    for entries in orders:
+        order = container()
+        for entry in entries:
+            order.append(entry)
+        built.append(order)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    totals = []
+    for order in built:
+        details = task.calculate_total_cents(order)
+        receipt = task.generate_receipt(order, details, True)
+        totals.append((details, receipt.count("\n")))
+    return build_time, time.perf_counter() - start, totals
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ORDERS
+    orders = generate_entries(entries, count)
+
+    list_build, list_price, list_totals = run(list, orders)
+    coalesced_build, coalesced_price, coalesced_totals = run(CoalescedOrder, orders)
+    assert [details for details, _ in coalesced_totals] == [details for details, _ in list_totals]
+
+    print(f"{count} orders of {entries} entries, {len(task.MENU)} menu items")
+    print("Container".ljust(12) + "build (s)".rjust(12) + "price+receipt (s)".rjust(20) + "receipt lines".rjust(15))
+    print("-" * 59)
+    for name, build, price, totals in [("list", list_build, list_price, list_totals),
+                                       ("coalesced", coalesced_build, coalesced_price, coalesced_totals)]:
+        lines = sum(length for _, length in totals) / len(totals)
+        print(f"{name:<12}{build:>12.3f}{price:>20.3f}{lines:>15.1f}")
+    print(f"price+receipt speedup: {list_price / coalesced_price:.1f}x, "
+          f"overall: {(list_build + list_price) / (coalesced_build + coalesced_price):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
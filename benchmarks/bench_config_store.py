@@ -0,0 +1,109 @@
+"""
+Benchmark: ConfigStore vs a lock-protected global
+
+Reader threads read two settings in a loop while one writer thread changes
+both of them every millisecond, for each number of readers:
+    locked global - a module dict read and written under a threading.Lock
+    ConfigStore   - ConfigStore from 2_Function/2_values.py, read without a lock
+
+Reports reads per second over all readers. Every read also checks that the two
+settings belong to the same update, which the writer always changes together.
+
+Usage:
+    python benchmarks/bench_config_store.py [seconds_per_run] [reader_threads ...]
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "2_Function"))
+values = importlib.import_module("2_values")
+
+DEFAULT_SECONDS = 1.0
+DEFAULT_READERS = [1, 2, 4, 8]
+WRITE_INTERVAL = 0.001
+
+SETTINGS = {"device_id": "0000", "idone": "0000"}
+SETTINGS_LOCK = threading.Lock()
+
+
+def read_locked():
+    with SETTINGS_LOCK:
+        return SETTINGS["device_id"], SETTINGS["idone"]
+
+
+def write_locked(new_id):
+    with SETTINGS_LOCK:
+        SETTINGS["device_id"] = new_id
+        SETTINGS["idone"] = new_id
+
+
+def make_store_functions():
+    """Return (read, write) functions for a fresh ConfigStore"""
+    store = values.ConfigStore(device_id="0000", idone="0000")
+
+    def read():
+        snapshot = store.snapshot()
+        return snapshot["device_id"], snapshot["idone"]
+
+    def write(new_id):
+        store.update(device_id=new_id, idone=new_id)
+
+    return read, write
+
+
+def run(read, write, readers, seconds):
+    """Return (reads per second, mismatched reads) for one run"""
+    stop = threading.Event()
+    counts = [0] * readers
+    mismatches = [0] * readers
+
+    def reader(slot):
+        count = mismatch = 0
+        while not stop.is_set():
+            for _ in range(1000):
+                device_id, idone = read()
+                if device_id != idone:
+                    mismatch += 1
+            count += 1000
+        counts[slot] = count
+        mismatches[slot] = mismatch
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            write(f"{i:04d}")
+            time.sleep(WRITE_INTERVAL)
+
+    threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(counts) / elapsed, sum(mismatches)
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECONDS
+    reader_counts = [int(arg) for arg in sys.argv[2:]] or DEFAULT_READERS
+
+    print("Readers".rjust(8) + "locked reads/s".rjust(17) + "store reads/s".rjust(16) + "speedup".rjust(10) + "torn".rjust(7))
+    print("-" * 58)
+    for readers in reader_counts:
+        locked_rate, locked_torn = run(read_locked, write_locked, readers, seconds)
+        store_rate, store_torn = run(*make_store_functions(), readers, seconds)
+        print(f"{readers:>8}{locked_rate:>17,.0f}{store_rate:>16,.0f}{store_rate / locked_rate:>9.2f}x"
+              f"{locked_torn + store_torn:>7}")
+
+
+if __name__ == "__main__":
+    main()
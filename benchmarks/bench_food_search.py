@@ -0,0 +1,83 @@
+"""
+Benchmark: SearchIndex vs a naive scan
+
+Builds a SearchIndex over a large synthetic menu and times prefix and
+misspelled queries against a naive scan that checks every name
+(startswith for prefixes, difflib for misspellings).
+
+Usage:
+    python benchmarks/bench_food_search.py [number_of_names]
+"""
+
+import difflib
+import importlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3_Class_and_OOP"))
+food_search = importlib.import_module("food_search")
+
+DEFAULT_NAMES = 100_000
+WORDS = ["Big", "Mac", "Quarter", "Pounder", "Chicken", "Crispy", "Spicy", "McNuggets", "Fries",
+         "Coca-Cola", "McFlurry", "Oreo", "Bacon", "Egg", "McMuffin", "Deluxe", "Double", "Cheese",
+         "Salad", "Wrap", "Shake", "Vanilla", "Caramel", "Apple", "Pie", "Hash", "Browns", "Filet"]
+
+
+def generate_names(count, seed=0):
+    """Return count distinct menu-like names"""
+    rng = random.Random(seed)
+    return [f"{' '.join(rng.sample(WORDS, rng.randint(2, 4)))} {i}" for i in range(count)]
+
+
+def misspell(name, rng):
+    """Drop one letter and swap two others, like a hurried customer"""
+    letters = list(name.split()[0] + " " + name.split()[1])
+    del letters[rng.randrange(len(letters))]
+    i = rng.randrange(len(letters) - 1)
+    letters[i], letters[i + 1] = letters[i + 1], letters[i]
+    return "".join(letters)
+
+
+def naive_search(names, query, limit=5):
+    """Scan every name: prefix matches first, otherwise difflib close matches"""
+    query = query.lower()
+    found = [name for name in names if name.lower().startswith(query)][:limit]
+    if len(found) < limit:
+        lowered = {name.lower(): name for name in names}
+        found += [lowered[match] for match in difflib.get_close_matches(query, lowered, limit - len(found))]
+    return found
+
+
+def time_queries(search, queries):
+    """Return the average milliseconds per query"""
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NAMES
+    rng = random.Random(1)
+    names = generate_names(count)
+
+    start = time.perf_counter()
+    index = food_search.SearchIndex(names)
+    build_time = time.perf_counter() - start
+
+    prefix_queries = [" ".join(rng.choice(names).split()[:2])[:rng.randint(3, 12)] for _ in range(200)]
+    typo_queries = [misspell(rng.choice(names), rng) for _ in range(200)]
+
+    print(f"{count} names, index built in {build_time:.2f} s")
+    print("Queries".ljust(12) + "SearchIndex (ms)".rjust(18) + "Naive scan (ms)".rjust(18))
+    print("-" * 48)
+    for label, queries, naive_count in [("prefix", prefix_queries, 20), ("misspelled", typo_queries, 3)]:
+        index_ms = time_queries(index.search, queries)
+        naive_ms = time_queries(lambda query: naive_search(names, query), queries[:naive_count])
+        print(f"{label:<12}{index_ms:>18.3f}{naive_ms:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
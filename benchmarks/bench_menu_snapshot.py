@@ -0,0 +1,87 @@
+"""
+Benchmark: cold start from a binary menu snapshot vs building the menu in Python
+
+Builds a large menu with Food/Category objects (the item names and modifier
+sets of bench_catalog_memory.py), saves it with menu_snapshot.save_menu() and
+then times, each in a fresh Python process so nothing is already imported or
+cached in memory:
+    build     - import 2_An_example, build the menu and look up one item
+    snapshot  - import menu_snapshot, load_menu() and look up one item
+
+Usage:
+    python benchmarks/bench_menu_snapshot.py [number_of_items]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS), "3_Class_and_OOP"))
+import bench_catalog_memory
+import menu_snapshot
+
+DEFAULT_ITEMS = 100_000
+RUNS = 3
+
+BUILD_SCRIPT = """
+import sys
+sys.path[:0] = [{benchmarks!r}, {oop!r}]
+import bench_catalog_memory
+menu = bench_catalog_memory.build_plain_menu(bench_catalog_memory.item_data({count}))
+assert menu.get_food("Item {last}") is not None
+"""
+
+LOAD_SCRIPT = """
+import sys
+sys.path[:0] = [{oop!r}]
+import menu_snapshot
+menu = menu_snapshot.load_menu({path!r})
+assert menu.get_food("Item {last}") is not None
+"""
+
+
+def time_script(script):
+    """Return the fastest wall time of running script in a new interpreter"""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script], check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITEMS
+    oop = os.path.join(os.path.dirname(BENCHMARKS), "3_Class_and_OOP")
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "menu.snapshot")
+        menu = bench_catalog_memory.build_plain_menu(bench_catalog_memory.item_data(count))
+        start = time.perf_counter()
+        menu_snapshot.save_menu(menu, path)
+        save_time = time.perf_counter() - start
+
+        loaded = menu_snapshot.load_menu(path)
+        for name, food in menu._food_index.items():
+            copy = loaded.get_food(name)
+            assert (copy.base_price, dict(copy.possible_modifications)) == \
+                   (food[0][1].base_price, food[0][1].possible_modifications)
+
+        empty_time = time_script("pass")
+        build_time = time_script(BUILD_SCRIPT.format(benchmarks=BENCHMARKS, oop=oop, count=count, last=count - 1))
+        load_time = time_script(LOAD_SCRIPT.format(oop=oop, path=path, last=count - 1))
+        size = os.path.getsize(path)
+
+    print(f"Menu of {count} items, snapshot file {size / 1024:.0f} KB written in {save_time:.3f} s")
+    print(f"Cold start (best of {RUNS}, {empty_time:.3f} s of it is starting Python)")
+    print("Method".ljust(12) + "Seconds".rjust(10))
+    print("-" * 22)
+    print(f"{'build':<12}{build_time:>10.3f}")
+    print(f"{'snapshot':<12}{load_time:>10.3f}")
+    print(f"Speedup: {(build_time - empty_time) / (load_time - empty_time):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
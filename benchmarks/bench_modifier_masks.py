@@ -0,0 +1,67 @@
+"""
+Benchmark: list vs bitmask modifier selections
+
+For the foods of create_mcdonalds_menu(), builds order lines that select two
+modifications, prices them and removes one, with:
+    OrderLine      - selected_modifications list, priced by looking up every selection
+    MaskOrderLine  - bitmask with a price table per food, from modifier_masks.py
+
+Usage:
+    python benchmarks/bench_modifier_masks.py [number_of_lines ...]
+"""
+
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3_Class_and_OOP"))
+example = importlib.import_module("2_An_example")
+modifier_masks = importlib.import_module("modifier_masks")
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+PRICE_CALLS = 5
+
+
+def run(line_class, foods, count):
+    """Return (seconds, total cents) for count lines of line_class"""
+    start = time.perf_counter()
+    total = 0
+    for i in range(count):
+        food, first, second = foods[i % len(foods)]
+        line = line_class(food)
+        line.select_modification(first)
+        line.select_modification(second)
+        for _ in range(PRICE_CALLS):
+            total += line.calculate_price_cents()
+        line.remove_modification(first)
+        total += line.calculate_price_cents()
+    return time.perf_counter() - start, total
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    with contextlib.redirect_stdout(io.StringIO()):
+        menu = example.create_mcdonalds_menu()
+    modifier_masks.use_modifier_masks(menu)
+    foods = []
+    for category in menu.categories.values():
+        for food in category.foods.values():
+            mods = list(food.possible_modifications)
+            if len(mods) >= 2:
+                foods.append((food, mods[0], mods[-1]))
+
+    print(f"Each line: 2 selections, {PRICE_CALLS + 1} prices, 1 removal")
+    print("Lines".rjust(10) + "list (s)".rjust(11) + "mask (s)".rjust(11) + "speedup".rjust(10))
+    print("-" * 42)
+    for count in sizes:
+        list_time, list_total = run(example.OrderLine, foods, count)
+        mask_time, mask_total = run(menu.order_line_class, foods, count)
+        assert list_total == mask_total
+        print(f"{count:>10}{list_time:>11.3f}{mask_time:>11.3f}{list_time / mask_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark: float vs Decimal vs integer cents pricing
+
+Prices the same batch of random orders three ways:
+    float    - calculate_total() from 2_Function/Answer
+    Decimal  - the same steps with decimal.Decimal, for reference
+    cents    - calculate_total_cents() from 2_Function/Answer
+
+and prints two differences in the grand total of all orders:
+    float drift   - float results against the same formulas worked out
+                    exactly (no rounding at all), i.e. float error alone
+    rounding gap  - float results against the cents results, which round
+                    the discount and tax of every order to whole cents
+
+Usage:
+    python benchmarks/bench_money.py [number_of_orders ...]
+"""
+
+import importlib
+import os
+import random
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_EVEN
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "2_Function", "Answer"))
+task = importlib.import_module("4_Hands_on_real_world_task")
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+MENU_DECIMAL = {item: Decimal(str(price)) for item, price in task.MENU.items()}
+CENT = Decimal("0.01")
+TAX_RATE = Decimal("0.08")
+DISCOUNT_RATE = Decimal("0.10") / 100
+
+
+def calculate_total_decimal(order):
+    """calculate_total() written with Decimal, rounding at the same points as the cents version"""
+    subtotal = Decimal(0)
+    for item in order:
+        subtotal += MENU_DECIMAL[item["name"]] * item["quantity"]
+
+    discount = Decimal(0)
+    if task.is_meal_deal_eligible([item["name"] for item in order]):
+        discount = subtotal - (subtotal * DISCOUNT_RATE).quantize(CENT, ROUND_HALF_EVEN)
+
+    tax = ((subtotal - discount) * TAX_RATE).quantize(CENT, ROUND_HALF_EVEN)
+    total = subtotal - discount + tax
+    return (subtotal, tax, discount, total)
+
+
+def calculate_total_exact(order):
+    """calculate_total() worked out exactly with Decimal, without rounding anywhere"""
+    subtotal = Decimal(0)
+    for item in order:
+        subtotal += MENU_DECIMAL[item["name"]] * item["quantity"]
+
+    discount = Decimal(0)
+    if task.is_meal_deal_eligible([item["name"] for item in order]):
+        discount = subtotal - subtotal * DISCOUNT_RATE
+
+    tax = (subtotal - discount) * TAX_RATE
+    return subtotal - discount + tax
+
+
+def generate_orders(count, seed=0):
+    """Return count random orders of 1-6 lines"""
+    rng = random.Random(seed)
+    names = list(task.MENU)
+    return [
+        [{"name": rng.choice(names), "quantity": rng.randint(1, 5)} for _ in range(rng.randint(1, 6))]
+        for _ in range(count)
+    ]
+
+
+def measure(function, orders):
+    """Return (seconds, results) for pricing every order"""
+    start = time.perf_counter()
+    results = [function(order) for order in orders]
+    return time.perf_counter() - start, results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print("Orders".rjust(10) + "float (s)".rjust(12) + "Decimal (s)".rjust(14) + "cents (s)".rjust(12) + "float drift".rjust(14)
+          + "rounding gap".rjust(14))
+    print("-" * 76)
+    for count in sizes:
+        orders = generate_orders(count)
+        float_time, float_results = measure(task.calculate_total, orders)
+        decimal_time, decimal_results = measure(calculate_total_decimal, orders)
+        cents_time, cents_results = measure(task.calculate_total_cents, orders)
+
+        # The cents and Decimal paths must agree to the cent
+        for cents, decimal in zip(cents_results, decimal_results):
+            assert all(Decimal(c) / 100 == d for c, d in zip(cents, decimal))
+
+        # Float error: the float grand total against the same formulas without any rounding
+        float_revenue = sum(result[3] for result in float_results)
+        exact_revenue = sum(calculate_total_exact(order) for order in orders)
+        drift = abs(Decimal(float_revenue) - exact_revenue)
+        # Rounding policy: the float grand total against the one rounded to cents per order
+        cents_revenue = sum(result[3] for result in cents_results)
+        gap = abs(Decimal(float_revenue) - Decimal(cents_revenue) / 100)
+
+        print(f"{count:>10} {float_time:>11.3f} {decimal_time:>13.3f} {cents_time:>11.3f} {drift:>13.2e}"
+              f" {gap:>13.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: bulk order import/export, CSV vs JSONL vs binary columns
+
+Writes the same random orders in each format of 2_Function/Answer/order_io.py,
+then reads them back and prices them:
+    CSV, JSONL  - read_csv() / read_jsonl() into dicts, then batch_pricing.calculate_totals()
+    columns     - read_columns(), then OrderColumns.price() with no dicts at all
+
+Reports orders per second for writing, reading, and reading plus pricing.
+
+Usage:
+    python benchmarks/bench_order_io.py [number_of_orders ...]
+"""
+
+import importlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "2_Function", "Answer"))
+task = importlib.import_module("4_Hands_on_real_world_task")
+import batch_pricing
+import order_io
+
+DEFAULT_SIZES = [10_000, 100_000]
+MODIFICATIONS = ["Extra Cheese", "No Pickles", "No Ice", "Extra Sauce", "No Salt"]
+
+
+def generate_orders(count, seed=0):
+    """Return count random orders of 1-6 lines, a third of them with modifications"""
+    rng = random.Random(seed)
+    names = list(task.MENU)
+    orders = []
+    for _ in range(count):
+        order = []
+        for _ in range(rng.randint(1, 6)):
+            item = {"name": rng.choice(names), "quantity": rng.randint(1, 5)}
+            if rng.random() < 1 / 3:
+                item["modifications"] = rng.sample(MODIFICATIONS, rng.randint(1, 2))
+            order.append(item)
+        orders.append(order)
+    return orders
+
+
+def timed(function):
+    """Return (seconds, result) of calling function()"""
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run_text_format(path, orders, write, read):
+    """Return (write s, read s, read and price s, totals) for the CSV or JSONL format"""
+    def write_file():
+        with open(path, "w", newline="") as f:
+            write(orders, f)
+
+    def read_file():
+        with open(path, newline="") as f:
+            return list(read(f))
+
+    def read_and_price():
+        return batch_pricing.calculate_totals(read_file())
+
+    write_time, _ = timed(write_file)
+    read_time, _ = timed(read_file)
+    price_time, totals = timed(read_and_price)
+    return write_time, read_time, price_time, totals
+
+
+def run_columns_format(path, orders):
+    """Return (write s, read s, read and price s, totals) for the binary columns"""
+    write_time, _ = timed(lambda: order_io.write_columns(order_io.encode_orders(orders, task.MENU), path))
+    read_time, _ = timed(lambda: order_io.read_columns(path))
+    price_time, totals = timed(lambda: order_io.read_columns(path).price())
+    return write_time, read_time, price_time, totals
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    print("Orders".rjust(9) + "Format".rjust(9) + "Write/s".rjust(12) + "Read/s".rjust(12)
+          + "Read+price/s".rjust(14) + "File KB".rjust(10))
+    print("-" * 66)
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in sizes:
+            orders = generate_orders(count)
+            expected = batch_pricing.calculate_totals(orders)
+            runs = [
+                ("CSV", "orders.csv", lambda path: run_text_format(path, orders, order_io.write_csv, order_io.read_csv)),
+                ("JSONL", "orders.jsonl", lambda path: run_text_format(path, orders, order_io.write_jsonl, order_io.read_jsonl)),
+                ("columns", "orders.col", lambda path: run_columns_format(path, orders)),
+            ]
+            for label, filename, run in runs:
+                path = os.path.join(workdir, filename)
+                write_time, read_time, price_time, totals = run(path)
+                assert all((a == b).all() for a, b in zip(totals, expected))
+                print(f"{count:>9}{label:>9}{count / write_time:>12,.0f}{count / read_time:>12,.0f}"
+                      f"{count / price_time:>14,.0f}{os.path.getsize(path) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
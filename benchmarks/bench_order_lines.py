@@ -0,0 +1,82 @@
+"""
+Benchmark: order lines vs copy.deepcopy
+
+Compares building order lines with copy.deepcopy(food) (the old
+Menu.add_to_order path) against the shared-catalog OrderLine type from
+3_Class_and_OOP/2_An_example.py.
+
+Usage:
+    python benchmarks/bench_order_lines.py [number_of_lines ...]
+"""
+
+import copy
+import importlib
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "3_Class_and_OOP"))
+example = importlib.import_module("2_An_example")
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def build_with_deepcopy(foods, count):
+    """Build order lines the old way, one deep copy per line"""
+    lines = []
+    for i in range(count):
+        line = copy.deepcopy(foods[i % len(foods)])
+        line.select_modification("Extra Cheese")
+        lines.append(line)
+    return lines
+
+
+def build_with_order_lines(foods, count):
+    """Build order lines that share the catalog Food"""
+    lines = []
+    for i in range(count):
+        line = example.OrderLine(foods[i % len(foods)])
+        line.select_modification("Extra Cheese")
+        lines.append(line)
+    return lines
+
+
+def measure(builder, foods, count):
+    """Return (seconds, price total) for building and pricing count lines"""
+    start = time.perf_counter()
+    lines = builder(foods, count)
+    total = sum(line.calculate_price() for line in lines)
+    return time.perf_counter() - start, total
+
+
+def bytes_per_line(builder, foods, count=10_000):
+    """Return the traced allocation per order line"""
+    tracemalloc.start()
+    lines = builder(foods, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del lines
+    return size / count
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    menu = example.create_mcdonalds_menu()
+    foods = [menu.get_food(name) for name in ("Big Mac", "Quarter Pounder", "Hamburger", "McDouble")]
+
+    print("Lines".rjust(10) + "deepcopy (s)".rjust(15) + "OrderLine (s)".rjust(15) + "Speedup".rjust(10))
+    print("-" * 50)
+    for count in sizes:
+        deep_time, deep_total = measure(build_with_deepcopy, foods, count)
+        line_time, line_total = measure(build_with_order_lines, foods, count)
+        assert abs(deep_total - line_total) < 1e-6 * count
+        print(f"{count:>10} {deep_time:>14.3f} {line_time:>14.3f} {deep_time / line_time:>9.1f}x")
+
+    print()
+    print(f"deepcopy:  {bytes_per_line(build_with_deepcopy, foods):.0f} bytes per line")
+    print(f"OrderLine: {bytes_per_line(build_with_order_lines, foods):.0f} bytes per line")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: settlement pipeline scaling from 1 to N worker processes
+
+Settles the same batch of random orders with SettlementPipeline in this process
+and then with 1, 2, 4, ... up to the number of CPU cores, checks that every run gives exactly the
+same receipts and per-item totals as the serial run, and that the receipts are the ones
+calculate_total() and generate_receipt() give when called one order at a time, and prints
+the speedup.
+
+Usage:
+    python benchmarks/bench_settlement.py [number_of_orders]
+"""
+
+import importlib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "2_Function", "Answer"))
+task = importlib.import_module("4_Hands_on_real_world_task")
+settlement = importlib.import_module("settlement")
+
+DEFAULT_ORDERS = 200_000
+
+
+def generate_orders(count, seed=0):
+    """Yield count random orders of 1-6 lines"""
+    rng = random.Random(seed)
+    names = list(task.MENU)
+    for _ in range(count):
+        yield [{"name": rng.choice(names), "quantity": rng.randint(1, 5)} for _ in range(rng.randint(1, 6))]
+
+
+def run(workers, count):
+    """Return (seconds, results, item totals) for settling count orders"""
+    pipeline = settlement.SettlementPipeline(workers=workers)
+    start = time.perf_counter()
+    results = list(pipeline.run(generate_orders(count)))
+    return time.perf_counter() - start, results, pipeline.item_totals
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDERS
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+
+    serial_time, serial_results, serial_totals = run(0, count)
+    for order, result in zip(generate_orders(count), serial_results):
+        financial_details = task.calculate_total(order)
+        assert result == (financial_details, task.generate_receipt(order, financial_details))
+    print(f"{count} orders, {cores} CPU cores")
+    print("Workers".rjust(8) + "Time (s)".rjust(10) + "Orders/s".rjust(12) + "Speedup".rjust(9))
+    print("-" * 39)
+    print(f"{'serial':>8}{serial_time:>10.2f}{count / serial_time:>12.0f}{1:>8.1f}x")
+    for workers in worker_counts:
+        seconds, results, totals = run(workers, count)
+        assert results == serial_results and totals == serial_totals
+        print(f"{workers:>8}{seconds:>10.2f}{count / seconds:>12.0f}{serial_time / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Profile the ordering flows
+
+Runs the console flow take_order() -> calculate_total() -> generate_receipt()
+from 2_Function/Answer with scripted input, and the OOP flow
+Menu.add_to_order() -> calculate_order_total() from 3_Class_and_OOP. Both run
+with the Profiler from instrumentation.py patched in, and the script prints a
+table and writes profile.json and profile.folded.
+
+Usage:
+    python benchmarks/profile_ordering.py [number_of_orders] [output_directory]
+"""
+
+import builtins
+import contextlib
+import importlib
+import io
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "2_Function", "Answer"))
+sys.path.insert(0, os.path.join(ROOT, "3_Class_and_OOP"))
+task = importlib.import_module("4_Hands_on_real_world_task")
+example = importlib.import_module("2_An_example")
+
+from instrumentation import Profiler
+
+DEFAULT_ORDERS = 2000
+
+
+def scripted_input(orders):
+    """Return an input() replacement that types the given orders"""
+    answers = []
+    for order in orders:
+        for item in order:
+            answers += [item["name"], str(item["quantity"])]
+        answers.append("done")
+    answers = iter(answers)
+    return lambda prompt="": next(answers)
+
+
+def run_console_flow(orders):
+    """Take, price and print every order like main() does"""
+    original_input = builtins.input
+    builtins.input = scripted_input(orders)
+    try:
+        for _ in orders:
+            order = task.take_order()
+            financial_details = task.calculate_total(order)
+            task.generate_receipt(order, financial_details)
+    finally:
+        builtins.input = original_input
+
+
+def run_menu_flow(orders, menu):
+    """Add every order to the OOP menu, select a modification and total it"""
+    for order in orders:
+        for item in order:
+            line = menu.add_to_order(item)
+            mods = list(line.possible_modifications)
+            if mods:
+                line.select_modification(mods[0])
+        menu.calculate_order_total()
+        menu.clear_order()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDERS
+    output_directory = sys.argv[2] if len(sys.argv) > 2 else "."
+    rng = random.Random(0)
+    names = list(task.MENU)
+    console_orders = [
+        [{"name": rng.choice(names), "quantity": rng.randint(1, 5)} for _ in range(rng.randint(1, 6))]
+        for _ in range(count)
+    ]
+    menu = example.create_mcdonalds_menu()
+    food_names = [food.name for category in menu.categories.values() for food in category.foods.values()]
+    menu_orders = [[rng.choice(food_names) for _ in range(rng.randint(1, 6))] for _ in range(count)]
+
+    profiler = Profiler()
+    profiler.patch(task, ["take_order", "calculate_total", "generate_receipt", "is_meal_deal_eligible",
+                          "calculate_tax", "apply_discount", "format_currency"])
+    profiler.patch(example.Menu, ["add_to_order", "get_food", "calculate_order_total", "clear_order"])
+    profiler.patch(example.OrderLine, ["select_modification"])
+    profiler.patch(example.Food, ["calculate_price", "get_description"])
+    try:
+        with profiler.enabled_block(), contextlib.redirect_stdout(io.StringIO()):
+            with profiler.section("console flow"):
+                run_console_flow(console_orders)
+            with profiler.section("menu flow"):
+                run_menu_flow(menu_orders, menu)
+    finally:
+        profiler.unpatch()
+
+    print("Function".ljust(52) + "Calls".rjust(8) + "Total ms".rjust(10) + "p50 us".rjust(9)
+          + "p99 us".rjust(9) + "Peak KB".rjust(9) + "Net KB".rjust(9))
+    print("-" * 106)
+    for name, stats in profiler.report().items():
+        print(f"{name:<52}{stats['calls']:>8}{stats['total_s'] * 1e3:>10.1f}{stats['p50_s'] * 1e6:>9.1f}"
+              f"{stats['p99_s'] * 1e6:>9.1f}{stats['peak_alloc_bytes'] / 1024:>9.1f}"
+              f"{stats['net_alloc_bytes'] / 1024:>9.1f}")
+
+    profiler.write_json(os.path.join(output_directory, "profile.json"))
+    profiler.write_collapsed(os.path.join(output_directory, "profile.folded"))
+    print(f"\nWrote profile.json and profile.folded to {os.path.abspath(output_directory)}")
+
+
+if __name__ == "__main__":
+    main()
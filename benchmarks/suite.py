@@ -0,0 +1,406 @@
+"""
+Benchmark suite for every module in the repository
+
+Times the measurable hot spots of each lesson on synthetic workloads:
+    basic     - add_until_end() in 1_basic/methods.py and the 1_basic/loop.py script
+    function  - calculate() / caca() and the device id globals in 2_Function
+    files     - the .txt helpers, LogWriter and MappedTextFile in 2_Function
+    pricing   - calculate_total(), receipts, meal deals and batch pricing in 2_Function/Answer
+    oop       - building, searching and ordering from the Menu in 3_Class_and_OOP
+
+Workloads are generated from a fixed seed and the sizes given on the command
+line, so two runs with the same options do the same work. Results are saved as
+JSON (seconds per operation for each benchmark, with the options and Python
+version) and can be compared with a saved baseline to spot regressions.
+
+Usage:
+    python benchmarks/suite.py                               # run and print
+    python benchmarks/suite.py --output results.json         # also save
+    python benchmarks/suite.py --baseline baseline.json      # compare, exit 1 on regression
+    python benchmarks/suite.py --only pricing --order-count 50000
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import random
+import runpy
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ["1_basic", "2_Function", os.path.join("2_Function", "Answer"), "3_Class_and_OOP"]:
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    methods = importlib.import_module("methods")
+    function_definition = importlib.import_module("1_function_definition")
+    values = importlib.import_module("2_values")
+    files = importlib.import_module("3_open_and_write_files")
+    task = importlib.import_module("4_Hands_on_real_world_task")
+    extension = importlib.import_module("extension")
+    batch_pricing = importlib.import_module("batch_pricing")
+    receipt_cache = importlib.import_module("receipt_cache")
+    order_io = importlib.import_module("order_io")
+    sales_analytics = importlib.import_module("sales_analytics")
+    coalesced_order = importlib.import_module("coalesced_order")
+    example = importlib.import_module("2_An_example")
+    menu_snapshot = importlib.import_module("menu_snapshot")
+
+BENCHMARKS = {}  # name: function(options, workdir) returning (callable, operations per call)
+
+
+def benchmark(name):
+    """Register a benchmark under a "group.name" name"""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# Workload generators
+
+def make_orders(count, size, names, seed=0):
+    """Return count orders of 1 to size lines of {"name", "quantity"} dicts"""
+    rng = random.Random(seed)
+    return [
+        [{"name": rng.choice(names), "quantity": rng.randint(1, 5)} for _ in range(rng.randint(1, size))]
+        for _ in range(count)
+    ]
+
+
+def make_oop_menu(size, seed=0):
+    """Return a Menu with create_mcdonalds_menu() plus synthetic foods up to size items"""
+    rng = random.Random(seed)
+    menu = example.create_mcdonalds_menu()
+    extra = example.Category("Extra")
+    menu.add_category(extra)
+    count = sum(len(category.foods) for category in menu.categories.values())
+    for i in range(count, size):
+        food = example.Food(f"Item {i}", round(rng.uniform(0.99, 12.99), 2))
+        food.add_multiple_modifications({"Extra Cheese": 0.50, "No Pickles": 0.00, "Extra Patty": 1.50})
+        extra.add_food(food)
+    return menu
+
+
+def make_text_file(path, size_bytes, seed=0):
+    """Write a log-like text file of about size_bytes and return its path"""
+    rng = random.Random(seed)
+    written = 0
+    with open(path, "w") as f:
+        while written < size_bytes:
+            line = f"order {written} {rng.choice(list(task.MENU))} x{rng.randint(1, 5)}\n"
+            f.write(line)
+            written += len(line)
+    return path
+
+
+# basic
+
+@benchmark("basic.add_until_end")
+def bench_add_until_end(options, workdir):
+    return (lambda: methods.add_until_end(0, 10_000, 0.5)), 1
+
+
+@benchmark("basic.loop_script")
+def bench_loop_script(options, workdir):
+    path = os.path.join(ROOT, "1_basic", "loop.py")
+    return (lambda: runpy.run_path(path)), 1
+
+
+# function
+
+@benchmark("function.calculate")
+def bench_calculate(options, workdir):
+    values_ = list(range(10_000))
+    return (lambda: [function_definition.calculate(a) for a in values_]), len(values_)
+
+
+@benchmark("function.caca")
+def bench_caca(options, workdir):
+    grid = [(a, c, b) for a in range(1, 21) for c in range(20) for b in range(25)]
+    return (lambda: [function_definition.caca(a, c, b) for a, c, b in grid]), len(grid)
+
+
+@benchmark("function.update_device_id")
+def bench_update_device_id(options, workdir):
+    ids = [f"{i:04d}" for i in range(10_000)]
+
+    def run():
+        for device_id in ids:
+            values.update_device_id(device_id)
+            values.update_device_idone(device_id)
+    return run, len(ids)
+
+
+@benchmark("function.config_store_read")
+def bench_config_store_read(options, workdir):
+    store = values.ConfigStore(device_id="0000", idone="0001")
+    reads = 10_000
+    return (lambda: [store.get("device_id") for _ in range(reads)]), reads
+
+
+# files
+
+@benchmark("files.write_line_to_file")
+def bench_write_line_to_file(options, workdir):
+    path = os.path.join(workdir, "write_line.txt")
+    lines = options.file_lines
+
+    def run():
+        files.create_txt_file(path)
+        for i in range(lines):
+            files.write_line_to_file(path, f"line {i}")
+        os.remove(path)
+    return run, lines
+
+
+@benchmark("files.log_writer")
+def bench_log_writer(options, workdir):
+    path = os.path.join(workdir, "log_writer.txt")
+    lines = options.file_lines
+
+    def run():
+        with files.LogWriter(path) as writer:
+            for i in range(lines):
+                writer.write_line(f"line {i}")
+        os.remove(path)
+    return run, lines
+
+
+@benchmark("files.print_file_content")
+def bench_print_file_content(options, workdir):
+    path = make_text_file(os.path.join(workdir, "read.txt"), options.file_size)
+    return (lambda: files.print_file_content(path)), 1
+
+
+@benchmark("files.read_lines")
+def bench_read_lines(options, workdir):
+    path = make_text_file(os.path.join(workdir, "read.txt"), options.file_size)
+    return (lambda: sum(1 for _ in files.read_lines(path))), 1
+
+
+@benchmark("files.mapped_index_and_tail")
+def bench_mapped(options, workdir):
+    path = make_text_file(os.path.join(workdir, "read.txt"), options.file_size)
+
+    def run():
+        with files.MappedTextFile(path) as mapped:
+            mapped.tail(100)
+            mapped.line(mapped.count_lines() // 2)
+    return run, 1
+
+
+# pricing
+
+def pricing_orders(options):
+    """Return the orders priced by the pricing benchmarks"""
+    return make_orders(options.order_count, options.order_size, list(task.MENU))
+
+
+@benchmark("pricing.calculate_total")
+def bench_calculate_total(options, workdir):
+    orders = pricing_orders(options)
+    return (lambda: [task.calculate_total(order) for order in orders]), len(orders)
+
+
+@benchmark("pricing.calculate_total_cents")
+def bench_calculate_total_cents(options, workdir):
+    orders = pricing_orders(options)
+    return (lambda: [task.calculate_total_cents(order) for order in orders]), len(orders)
+
+
+@benchmark("pricing.batch_calculate_totals")
+def bench_batch_totals(options, workdir):
+    orders = pricing_orders(options)
+    return (lambda: batch_pricing.calculate_totals(orders)), len(orders)
+
+
+@benchmark("pricing.sales_aggregator")
+def bench_sales_aggregator(options, workdir):
+    orders = pricing_orders(options)
+    return (lambda: sales_analytics.SalesAggregator().add_orders(orders).top_items()), len(orders)
+
+
+@benchmark("pricing.coalesced_order")
+def bench_coalesced_order(options, workdir):
+    # Every entry of an order is one unit, as typed into take_order()
+    entries = [{"name": item["name"], "quantity": 1} for order in pricing_orders(options) for item in order]
+    return (lambda: task.calculate_total_cents(coalesced_order.CoalescedOrder(entries))), len(entries)
+
+
+@benchmark("pricing.read_order_columns")
+def bench_order_columns(options, workdir):
+    path = os.path.join(workdir, "orders.col")
+    order_io.write_columns(order_io.encode_orders(pricing_orders(options), task.MENU), path)
+    return (lambda: order_io.read_columns(path).price()), options.order_count
+
+
+@benchmark("pricing.is_meal_deal_eligible")
+def bench_meal_deal(options, workdir):
+    item_lists = [[item["name"] for item in order] for order in pricing_orders(options)]
+    return (lambda: [extension.is_meal_deal_eligible(items) for items in item_lists]), len(item_lists)
+
+
+@benchmark("pricing.generate_receipt")
+def bench_generate_receipt(options, workdir):
+    orders = pricing_orders(options)
+    details = [task.calculate_total(order) for order in orders]
+    return (lambda: [task.generate_receipt(o, d) for o, d in zip(orders, details)]), len(orders)
+
+
+@benchmark("pricing.receipt_renderer")
+def bench_receipt_renderer(options, workdir):
+    orders = pricing_orders(options)
+    details = [task.calculate_total(order) for order in orders]
+    renderer = receipt_cache.ReceiptRenderer()
+    return (lambda: [renderer.render(o, d) for o, d in zip(orders, details)]), len(orders)
+
+
+# oop
+
+@benchmark("oop.build_menu")
+def bench_build_menu(options, workdir):
+    return (lambda: make_oop_menu(options.menu_size)), options.menu_size
+
+
+@benchmark("oop.get_food")
+def bench_get_food(options, workdir):
+    menu = make_oop_menu(options.menu_size)
+    names = [food.name for category in menu.categories.values() for food in category.foods.values()]
+    return (lambda: [menu.get_food(name) for name in names]), len(names)
+
+
+@benchmark("oop.add_to_order_and_total")
+def bench_add_to_order(options, workdir):
+    menu = make_oop_menu(options.menu_size)
+    names = [food.name for category in menu.categories.values() for food in category.foods.values()]
+    orders = [[random.Random(i).choice(names) for _ in range(options.order_size)] for i in range(options.order_count // 10)]
+
+    def run():
+        for order in orders:
+            for name in order:
+                line = menu.add_to_order(name)
+                line.select_modification("Extra Cheese")
+            menu.calculate_order_total()
+            menu.clear_order()
+    return run, len(orders)
+
+
+@benchmark("oop.suggest_food")
+def bench_suggest_food(options, workdir):
+    menu = make_oop_menu(options.menu_size)
+    menu.suggest_food("warm up")  # Build the search index outside the timing
+    queries = ["big", "quater pounder", "mcnugets", "item 12", "chiken sandwch"] * 20
+    return (lambda: [menu.suggest_food(query) for query in queries]), len(queries)
+
+
+@benchmark("oop.load_menu_snapshot")
+def bench_load_menu_snapshot(options, workdir):
+    path = os.path.join(workdir, "menu.snapshot")
+    menu_snapshot.save_menu(make_oop_menu(options.menu_size), path)
+    return (lambda: menu_snapshot.load_menu(path).get_food("Big Mac")), options.menu_size
+
+
+# Running and comparing
+
+def measure(run, repeat):
+    """Return the fastest of repeat timings of run(), in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_suite(options):
+    """Run the selected benchmarks and return the results document"""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(io.StringIO()):
+        for name, setup in BENCHMARKS.items():
+            if options.only and not any(name.startswith(prefix) for prefix in options.only):
+                continue
+            run, operations = setup(options, workdir)
+            seconds = measure(run, options.repeat)
+            results[name] = {"seconds": seconds, "operations": operations, "seconds_per_op": seconds / operations}
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {key: getattr(options, key) for key in WORKLOAD_OPTIONS},
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print current results next to the baseline and return the names that got slower"""
+    regressions = []
+    print("Benchmark".ljust(34) + "Baseline us/op".rjust(16) + "Current us/op".rjust(16) + "Change".rjust(10))
+    print("-" * 76)
+    for name, result in current["results"].items():
+        now = result["seconds_per_op"] * 1e6
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<34}{'-':>16}{now:>16.3f}{'new':>10}")
+            continue
+        before = before["seconds_per_op"] * 1e6
+        change = (now - before) / before if before else 0.0
+        flag = "  SLOWER" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<34}{before:>16.3f}{now:>16.3f}{change:>+10.1%}{flag}")
+    if current["options"] != baseline.get("options"):
+        print("\nNote: the baseline was recorded with different workload options")
+    return regressions
+
+
+def print_results(current):
+    """Print the results table"""
+    print("Benchmark".ljust(34) + "Ops".rjust(10) + "Total s".rjust(10) + "us/op".rjust(12))
+    print("-" * 66)
+    for name, result in current["results"].items():
+        print(f"{name:<34}{result['operations']:>10}{result['seconds']:>10.4f}{result['seconds_per_op'] * 1e6:>12.3f}")
+
+
+WORKLOAD_OPTIONS = ["menu_size", "order_size", "order_count", "file_size", "file_lines", "repeat"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite for Learn-Python-from-abc")
+    parser.add_argument("--menu-size", type=int, default=10_000, help="foods in the OOP menu")
+    parser.add_argument("--order-size", type=int, default=6, help="maximum lines per order")
+    parser.add_argument("--order-count", type=int, default=10_000, help="orders to price")
+    parser.add_argument("--file-size", type=int, default=5_000_000, help="bytes in the text files read")
+    parser.add_argument("--file-lines", type=int, default=5_000, help="lines written by the file writers")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark, the fastest is kept")
+    parser.add_argument("--only", nargs="*", help="run only benchmarks whose names start with these")
+    parser.add_argument("--output", help="save the results as JSON here")
+    parser.add_argument("--baseline", help="compare with results saved earlier with --output")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    options = parser.parse_args()
+
+    current = run_suite(options)
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if not options.baseline:
+        print_results(current)
+        return 0
+
+    with open(options.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, options.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {options.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
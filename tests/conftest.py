@@ -0,0 +1,8 @@
+"""Put the lesson directories on sys.path, like benchmarks/suite.py does"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ["1_basic", "2_Function", os.path.join("2_Function", "Answer"), "3_Class_and_OOP"]:
+    sys.path.insert(0, os.path.join(ROOT, directory))
@@ -0,0 +1,49 @@
+import importlib
+import random
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+from coalesced_order import CoalescedOrder
+
+
+def random_entries(rng):
+    names = list(task.MENU)
+    return [{"name": rng.choice(names), "quantity": rng.randint(1, 5)} for _ in range(rng.randint(1, 12))]
+
+
+def summary(receipt):
+    """Return the receipt lines after the item lines"""
+    return receipt.split("-" * 40)[-1]
+
+
+def test_coalesced_receipts_match_uncoalesced():
+    rng = random.Random(0)
+    for _ in range(3000):
+        entries = random_entries(rng)
+        coalesced = CoalescedOrder(entries)
+        same_lines = [dict(line) for line in coalesced]
+        details = task.calculate_total(entries)
+        assert task.calculate_total(coalesced) == details
+        assert task.calculate_total(same_lines) == details
+        receipt = task.generate_receipt(coalesced, details)
+        assert receipt == task.generate_receipt(same_lines, details)
+        assert summary(receipt) == summary(task.generate_receipt(entries, details))
+        assert task.calculate_total_cents(coalesced) == task.calculate_total_cents(entries)
+
+
+def test_menu_coalesced_lines_match_separate_lines(capsys):
+    example = importlib.import_module("2_An_example")
+    coalesced, separate = example.create_mcdonalds_menu(), example.create_mcdonalds_menu()
+    rng = random.Random(1)
+    names = ["Big Mac", "Coffee", "Apple Pie"]
+    for _ in range(200):
+        name = rng.choice(names)
+        mods = ["Extra Cheese"] if name == "Big Mac" and rng.random() < 0.5 else []
+        coalesced.add_to_order(name, 1, mods)
+        line = separate.add_to_order(name)
+        for mod in mods:
+            line.select_modification(mod)
+    assert len(coalesced.current_order) == 4
+    assert coalesced.get_order_total(in_cents=True) == separate.get_order_total(in_cents=True)
+    coalesced.remove_units_from_order(0, 2)
+    assert coalesced.current_order.subtotal_cents == sum(
+        line.calculate_price_cents() * line.quantity for line in coalesced.current_order)
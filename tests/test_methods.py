@@ -0,0 +1,18 @@
+import random
+from decimal import Decimal
+from fractions import Fraction
+
+import methods
+
+
+def test_count_steps_batch_object_inputs_are_exact():
+    rng = random.Random(0)
+    rows = []
+    for _ in range(300):
+        step = Fraction(rng.randint(1, 50), rng.randint(1, 50))
+        rows.append((Fraction(rng.randint(-100, 100), 7), Fraction(rng.randint(-100, 100), 3), step))
+    rows.append((Decimal("0.1"), Decimal("1"), Decimal("0.1")))
+    rows.append((0, 10 ** 30, Fraction(1, 3)))
+    expected = [methods.count_steps(*row) for row in rows]
+    inits, ends, steps = (list(column) for column in zip(*rows))
+    assert list(methods.count_steps_batch(inits, ends, steps)) == expected
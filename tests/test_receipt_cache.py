@@ -0,0 +1,21 @@
+import importlib
+
+task = importlib.import_module("4_Hands_on_real_world_task")
+receipt_cache = importlib.import_module("receipt_cache")
+
+
+def test_render_sees_direct_price_change():
+    order = [{"name": "Big Mac", "quantity": 2}, {"name": "Coke", "quantity": 1}]
+    renderer = receipt_cache.ReceiptRenderer()
+    original = task.MENU["Big Mac"]
+    renderer.render(order, task.calculate_total(order))
+    try:
+        task.MENU["Big Mac"] = 9.99
+        financial_details = task.calculate_total(order)
+        assert renderer.render(order, financial_details) == task.generate_receipt(order, financial_details)
+        assert task.MENU_CENTS["Big Mac"] == 999
+        cents_details = task.calculate_total_cents(order)
+        assert (renderer.render(order, cents_details, in_cents=True)
+                == task.generate_receipt(order, cents_details, in_cents=True))
+    finally:
+        task.MENU["Big Mac"] = original
@@ -0,0 +1,14 @@
+import importlib
+
+settlement = importlib.import_module("settlement")
+
+
+def test_each_run_starts_its_totals_from_zero():
+    orders = [[{"name": "Big Mac", "quantity": 2}, {"name": "Coke", "quantity": 1}]] * 3
+    pipeline = settlement.SettlementPipeline(workers=0, shard_size=2)
+    list(pipeline.run(orders))
+    first = {item: list(totals) for item, totals in pipeline.item_totals.items()}
+    list(pipeline.run(orders))
+    assert pipeline.item_totals == first
+    assert pipeline.order_count == 3
+    assert first["Big Mac"][settlement.QUANTITY] == 6